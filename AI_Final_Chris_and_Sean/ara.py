@@ -0,0 +1,173 @@
+########################################################
+#### Weighted and anytime A* (ARA*).
+#### COEFFASTAR orders the open list by 2g + h and GBFS by
+#### h alone. Both are weighted A*: f = g + w * h orders
+#### the cells the same way as a * g + b * h with w = b / a,
+#### so COEFFASTAR is w = 0.5 and GBFS is w = inf (cells
+#### are ordered by h, ties by g). w > 1 finds a path with
+#### fewer expansions, at most w times the optimal cost.
+####
+#### ARA* runs the weights of a schedule from high to low.
+#### The first path comes fast; every later pass keeps g()
+#### of the earlier passes and only expands the cells whose
+#### g() improved (the INCONS list), so the path gets
+#### better for little extra work. Each solution carries
+#### the bound cost / optimal <= bound, from the smallest
+#### g + h left on the open lists.
+####
+#### Works for the hospital maze (walls 13 and -1) and
+#### the HW4 mazes (wall_codes=(1,)).
+#### AI, Spring 2024
+########################################################
+import heapq
+import time
+
+from grid import WALL_CODES, wall_mask
+
+INF = float("inf")
+
+#### E, W, S and N, same order as find_path
+MOVES = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+#### Weights of the anytime passes, the last one is optimal
+WEIGHTS = (3.0, 2.0, 1.5, 1.25, 1.0)
+
+#### Time find_path may spend on better paths, in seconds
+TIME_BUDGET = 0.005
+
+
+######################################################
+#### A path found by one pass of the search
+######################################################
+class Solution:
+    def __init__(self, path, weight, bound):
+        self.path = path
+        self.cost = len(path) - 1
+        self.weight = weight
+        #### The cost is at most bound times the optimal cost
+        self.bound = bound
+
+
+class AnytimeAStar:
+    def __init__(self, maze, weights=WEIGHTS, time_budget=TIME_BUDGET, wall_codes=WALL_CODES):
+        self.rows = len(maze)
+        self.cols = len(maze[0])
+        self.walls = wall_mask(maze, wall_codes)
+        self.weights = weights
+        #### None runs every weight of the schedule
+        self.time_budget = time_budget
+        #### Cells expanded over every pass of the last search
+        self.expanded = 0
+        #### Solutions of the last search, best last
+        self.solutions = []
+
+    def heuristic(self, pos, goal):
+        return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+
+    #### Open list priority of a cell under weight w
+    def key(self, g, h, weight):
+        if weight == INF:
+            return (h, g)
+        return (g + weight * h, g)
+
+    ############################################################
+    #### Best path found within the time budget, None if the
+    #### goal can not be reached. The first pass always runs to
+    #### its end, a later pass stops as soon as time is up and
+    #### the path of the pass before is kept.
+    ############################################################
+    def find_path(self, start, goal):
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        best = None
+        for solution in self.search(start, goal, deadline=deadline):
+            best = solution
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return None if best is None else best.path
+
+    ############################################################
+    #### Shortest path with one weight, e.g. 0.5 for COEFFASTAR
+    #### or inf for GBFS. None if the goal can not be reached.
+    ############################################################
+    def weighted_path(self, start, goal, weight):
+        for solution in self.search(start, goal, (weight,)):
+            return solution.path
+        return None
+
+    ############################################################
+    #### Yield a Solution for every weight of the schedule,
+    #### each at least as good as the one before. The caller
+    #### stops whenever it is out of time; with a deadline
+    #### (time.perf_counter() seconds) a pass after the first
+    #### one also stops in the middle once it is reached.
+    ############################################################
+    def search(self, start, goal, weights=None, deadline=None):
+        self.expanded = 0
+        self.solutions = []
+        rows, cols, walls = self.rows, self.cols, self.walls
+        if walls[start[0] * cols + start[1]] or walls[goal[0] * cols + goal[1]]:
+            return
+
+        g = {start: 0}
+        parent = {start: None}
+        h = {start: self.heuristic(start, goal)}
+        #### Open cells and their current key, keyed per pass
+        open_keys = {start: None}
+        #### Cells whose g() improved after they were closed in this pass
+        incons = set()
+
+        for weight in weights or self.weights:
+            #### The INCONS cells are opened again, every key uses the new weight
+            open_keys = {s: self.key(g[s], h[s], weight) for s in list(open_keys) + list(incons)}
+            incons = set()
+            heap = [(key, s) for s, key in open_keys.items()]
+            heapq.heapify(heap)
+            closed = set()
+
+            #### Expand until no open cell can give a cheaper goal
+            while heap:
+                key, s = heap[0]
+                if open_keys.get(s) != key:
+                    heapq.heappop(heap)
+                    continue
+                if s == goal or (weight != INF and g.get(goal, INF) <= key[0]):
+                    break
+                if deadline is not None and self.solutions and time.perf_counter() >= deadline:
+                    return
+                heapq.heappop(heap)
+                del open_keys[s]
+                closed.add(s)
+                self.expanded += 1
+                new_g = g[s] + 1
+                for dx, dy in MOVES:
+                    new = (s[0] + dx, s[1] + dy)
+                    if not (0 <= new[0] < rows and 0 <= new[1] < cols) or walls[new[0] * cols + new[1]]:
+                        continue
+                    if new_g < g.get(new, INF):
+                        g[new] = new_g
+                        parent[new] = s
+                        if new not in h:
+                            h[new] = self.heuristic(new, goal)
+                        if new in closed:
+                            incons.add(new)
+                        else:
+                            open_keys[new] = self.key(new_g, h[new], weight)
+                            heapq.heappush(heap, (open_keys[new], new))
+
+            if goal not in g:
+                return
+
+            #### No path can be cheaper than the smallest g + h still open
+            lower = min([g[s] + h[s] for s in open_keys] + [g[s] + h[s] for s in incons] + [g[goal]])
+            bound = max(1.0, min(weight, g[goal] / lower if lower > 0 else 1.0))
+            path = []
+            s = goal
+            while s is not None:
+                path.append(s)
+                s = parent[s]
+            path.reverse()
+            solution = Solution(path, weight, bound)
+            self.solutions.append(solution)
+            yield solution
+            if bound <= 1.0:
+                return
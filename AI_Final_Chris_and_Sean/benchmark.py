@@ -0,0 +1,338 @@
+########################################################
+#### Benchmark of every search strategy.
+#### Runs each strategy on a seeded set of random mazes
+#### from 10x10 up to 2000x2000, corner to corner, and
+#### records per run:
+####   - wall time of the search (setup time separately)
+####   - cells expanded, pushes and the peak open list size
+####   - peak memory of the search (tracemalloc)
+####   - path cost and the optimal cost from a BFS (a
+####     Dijkstra search for the octile costs of "eightway")
+#### The results go to a JSON lines file, one run per
+#### line, and a summary table is printed.
+####
+#### The HW4 scripts open a Tk window when they are
+#### imported, so their strategies are run here by one
+#### headless search with the same evaluation function,
+#### moves and heuristic as each script:
+####   ASTAR       f = g + h    4 moves  Manhattan
+####   GBFS        f = h        4 moves  Manhattan
+####   EASTAR      f = g + h    8 moves  Euclidean  seeded ties
+####   EGBFS       f = h        8 moves  Euclidean  seeded ties
+####   COEFFASTAR  f = 2g + h   4 moves  Manhattan
+#### EASTAR and EGBFS search with EightWayAStar (see
+#### eightway.py) set up the way the two scripts use it.
+#### The hospital planner is run with every search mode.
+####
+#### Run with:
+####   python benchmark.py --sizes 10 100 500 --out runs.jsonl
+#### AI, Spring 2024
+########################################################
+import argparse
+import heapq
+import json
+import math
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+from eightway import SQRT2, EightWayAStar
+from grid import wall_mask
+from openlist import ClosedHeapOpenList
+from planner import ENGINES, Planner
+
+#### Wall code of the generated mazes, same as the hospital walls
+WALL = 13
+
+MOVES4 = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+MOVES8 = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)]
+
+SIZES = [10, 50, 100, 500, 1000, 2000]
+
+
+def manhattan(pos, goal):
+    return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+
+
+def euclidean(pos, goal):
+    return math.sqrt((pos[0] - goal[0]) ** 2 + (pos[1] - goal[1]) ** 2)
+
+
+######################################################
+#### One HW4 script: f = g_weight * g + h_weight * h
+######################################################
+class Strategy:
+    def __init__(self, g_weight, h_weight, moves, heuristic):
+        self.g_weight = g_weight
+        self.h_weight = h_weight
+        self.moves = moves
+        self.heuristic = heuristic
+
+
+STRATEGIES = {
+    "ASTAR": Strategy(1, 1, MOVES4, manhattan),
+    "GBFS": Strategy(0, 1, MOVES4, manhattan),
+    "EASTAR": Strategy(1, 1, MOVES8, euclidean),
+    "EGBFS": Strategy(0, 1, MOVES8, euclidean),
+    "COEFFASTAR": Strategy(2, 1, MOVES4, manhattan),
+}
+
+
+############################################################
+#### Seeded random maze of size x size with walls on about
+#### density of the cells. A random staircase from the top
+#### left to the bottom right corner is kept open, so the
+#### goal can always be reached.
+############################################################
+def make_maze(size, seed, density=0.3):
+    rng = np.random.default_rng(seed)
+    maze = np.where(rng.random((size, size)) < density, WALL, 0).astype(np.int8)
+    steps = rng.permutation(np.array([0] * (size - 1) + [1] * (size - 1), dtype=np.int64))
+    xs = np.concatenate(([0], np.cumsum(steps)))
+    ys = np.concatenate(([0], np.cumsum(1 - steps)))
+    maze[xs, ys] = 0
+    return maze
+
+
+############################################################
+#### Cost of the shortest path by BFS, None if unreachable
+############################################################
+def optimal_cost(walls, rows, cols, start, goal, moves):
+    start = start[0] * cols + start[1]
+    goal = goal[0] * cols + goal[1]
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        if current == goal:
+            return dist[current]
+        x, y = divmod(current, cols)
+        for dx, dy in moves:
+            new_x = x + dx
+            new_y = y + dy
+            if 0 <= new_x < rows and 0 <= new_y < cols:
+                new = new_x * cols + new_y
+                if not walls[new] and new not in dist:
+                    dist[new] = dist[current] + 1
+                    queue.append(new)
+    return None
+
+
+############################################################
+#### Cost of the cheapest 8-neighbour path with diagonals of
+#### sqrt 2 that never cut a wall corner, None if unreachable
+############################################################
+def octile_cost(walls, rows, cols, start, goal):
+    start = start[0] * cols + start[1]
+    goal = goal[0] * cols + goal[1]
+    dist = {start: 0}
+    open_set = [(0, start)]
+    while open_set:
+        cost, current = heapq.heappop(open_set)
+        if cost > dist[current]:
+            continue
+        if current == goal:
+            return cost
+        x, y = divmod(current, cols)
+        for dx, dy in MOVES8:
+            new_x = x + dx
+            new_y = y + dy
+            if not (0 <= new_x < rows and 0 <= new_y < cols) or walls[new_x * cols + new_y]:
+                continue
+            if dx and dy and (walls[new_x * cols + y] or walls[x * cols + new_y]):
+                continue
+            new = new_x * cols + new_y
+            new_cost = cost + (SQRT2 if dx and dy else 1)
+            if new_cost < dist.get(new, math.inf):
+                dist[new] = new_cost
+                heapq.heappush(open_set, (new_cost, new))
+    return None
+
+
+############################################################
+#### Search the way the HW4 scripts do: heap of (f, cell),
+#### closed cells are reopened when a cheaper path is found.
+#### Every move costs 1. Returns the path (or None) and
+#### the search counters.
+############################################################
+def run_strategy(strategy, walls, rows, cols, start, goal):
+    moves = strategy.moves
+    g = {start: 0}
+    parent = {start: None}
+    open_set = ClosedHeapOpenList()
+    open_set.push(0, start)
+    while True:
+        entry = open_set.next()
+        if entry is None:
+            return None, counters(open_set)
+        current_cost, current = entry
+        if current == goal:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = parent[current]
+            path.reverse()
+            return path, counters(open_set)
+        new_g = g[current] + 1
+        for dx, dy in moves:
+            new_pos = (current[0] + dx, current[1] + dy)
+            if 0 <= new_pos[0] < rows and 0 <= new_pos[1] < cols and not walls[new_pos[0] * cols + new_pos[1]]:
+                if new_g < g.get(new_pos, math.inf):
+                    g[new_pos] = new_g
+                    parent[new_pos] = current
+                    open_set.reopen(new_pos)
+                    open_set.push(strategy.g_weight * new_g + strategy.h_weight * strategy.heuristic(new_pos, goal), new_pos)
+                else:
+                    open_set.skip(new_pos)
+
+
+#### Counters of an open list under the names of the results
+def counters(open_set):
+    stats = open_set.stats()
+    return {"expanded": stats["expanded"], "pushes": stats["pushes"], "stale": stats["stale"], "peak_open": stats["peak"]}
+
+
+############################################################
+#### Search with the hospital planner, counters the search
+#### did not keep are None. A path the planner prices other
+#### than by its steps also gives its cost.
+############################################################
+def run_planner(planner, start, goal):
+    path = planner.find_path(start, goal)
+    counters = {"expanded": None, "pushes": None, "stale": None, "peak_open": None}
+    counters.update(planner.search_stats())
+    if path is not None and not planner.unit_steps:
+        counters["cost"] = planner.path_cost(path)
+    return path, counters
+
+
+############################################################
+#### EASTAR and EGBFS: any diagonal to an open cell, every
+#### move costs 1, Euclidean h() and ties broken in a
+#### random order fixed by the seed
+############################################################
+def run_eightway(engine, start, goal):
+    path = engine.find_path(start, goal)
+    return path, counters(engine.last_search)
+
+
+############################################################
+#### Setup of a strategy: builds what the search needs (timed
+#### on its own) and returns the search function
+############################################################
+def strategy_setup(strategy):
+    def setup(maze, walls, seed):
+        if strategy.moves is MOVES8:
+            engine = EightWayAStar(maze, corner_cutting="always", seed=seed, diagonal_cost=1, heuristic="euclidean", g_weight=strategy.g_weight)
+            return lambda start, goal: run_eightway(engine, start, goal)
+
+        def search(start, goal):
+            return run_strategy(strategy, walls, len(maze), len(maze[0]), start, goal)
+        return search
+    return setup
+
+
+def planner_setup(search):
+    def setup(maze, walls, seed):
+        planner = Planner(maze, search=search)
+        return lambda start, goal: run_planner(planner, start, goal)
+    return setup
+
+
+#### Setup of every strategy by name
+def strategies():
+    runs = {name: strategy_setup(strategy) for name, strategy in STRATEGIES.items()}
+    for search in ["astar"] + list(ENGINES):
+        runs["hospital-" + search] = planner_setup(search)
+    return runs
+
+
+############################################################
+#### Run one strategy on one maze. The search is timed
+#### without tracemalloc, which slows it down, and run a
+#### second time for the memory when memory is set.
+############################################################
+def benchmark(name, setup_search, maze, walls, seed, optimal, memory=True):
+    start = (0, 0)
+    goal = (len(maze) - 1, len(maze[0]) - 1)
+    began = time.perf_counter()
+    search = setup_search(maze, walls, seed)
+    setup = time.perf_counter() - began
+    began = time.perf_counter()
+    path, counters = search(start, goal)
+    elapsed = time.perf_counter() - began
+
+    peak_memory = None
+    if memory:
+        tracemalloc.start()
+        search(start, goal)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    cost = None if path is None else counters.pop("cost", len(path) - 1)
+    result = {
+        "strategy": name,
+        "size": len(maze),
+        "seed": seed,
+        "setup": setup,
+        "time": elapsed,
+        "memory": peak_memory,
+        "cost": cost,
+        "optimal": optimal,
+        "ratio": None if cost is None or not optimal else cost / optimal,
+    }
+    result.update(counters)
+    return result
+
+
+#### Summary table: one row per run
+def summary(results):
+    lines = ["%-22s %5s %10s %10s %10s %12s %8s %8s" % ("strategy", "size", "time (s)", "expanded", "peak open", "memory (KB)", "cost", "ratio")]
+    for r in results:
+        lines.append("%-22s %5d %10.4f %10s %10s %12s %8s %8s" % (
+            r["strategy"], r["size"], r["time"],
+            "-" if r["expanded"] is None else r["expanded"],
+            "-" if r["peak_open"] is None else r["peak_open"],
+            "-" if r["memory"] is None else r["memory"] // 1024,
+            "-" if r["cost"] is None else "%g" % r["cost"],
+            "-" if r["ratio"] is None else "%.3f" % r["ratio"]))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    runs = strategies()
+    parser = argparse.ArgumentParser(description="Benchmark the search strategies on generated mazes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--density", type=float, default=0.3, help="Share of wall cells")
+    parser.add_argument("--strategies", nargs="+", choices=sorted(runs), default=list(runs))
+    parser.add_argument("--out", default="benchmark.jsonl", help="JSON lines file for the results")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the tracemalloc run")
+    args = parser.parse_args()
+
+    results = []
+    with open(args.out, "w") as out:
+        for size in args.sizes:
+            seed = args.seed + size
+            maze = make_maze(size, seed, args.density)
+            walls = wall_mask(maze)
+            goal = (size - 1, size - 1)
+            optimal = {
+                4: optimal_cost(walls, size, size, (0, 0), goal, MOVES4),
+                8: optimal_cost(walls, size, size, (0, 0), goal, MOVES8),
+                "octile": octile_cost(walls, size, size, (0, 0), goal),
+            }
+            for name in args.strategies:
+                if name == "hospital-eightway":
+                    connectivity = "octile"
+                else:
+                    connectivity = 8 if name in STRATEGIES and STRATEGIES[name].moves is MOVES8 else 4
+                result = benchmark(name, runs[name], maze, walls, seed, optimal[connectivity], args.memory)
+                results.append(result)
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                print(summary([result]).splitlines()[1])
+    print()
+    print(summary(results))
@@ -0,0 +1,127 @@
+########################################################
+#### Bidirectional A* on a 4-connected unit cost grid.
+#### One A* runs forward from the start towards the goal
+#### and one backward from the goal towards the start,
+#### each with the Manhattan distance to its own target.
+#### The side with the smaller open list is expanded next.
+#### mu is the cost of the best path found so far through
+#### a cell both sides have reached. Every path still to
+#### be found runs through a cell on each open list, so
+#### once the smallest f() of either open list is at
+#### least mu no shorter path is left and mu is optimal.
+####
+#### Works for the hospital maze (walls 13 and -1) and
+#### the HW4 mazes (wall_codes=(1,)).
+#### AI, Spring 2024
+########################################################
+import heapq
+
+from grid import WALL_CODES, wall_mask
+
+INF = float("inf")
+
+#### E, W, S and N, same order as find_path
+MOVES = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+######################################################
+#### One direction of the search
+######################################################
+class Frontier:
+    def __init__(self, source, target):
+        self.target = target
+        self.g = {source: 0}
+        self.parent = {source: None}
+        self.closed = set()
+        self.open_set = [(self.heuristic(source), source)]
+        self.expanded = 0
+
+    def heuristic(self, pos):
+        return abs(pos[0] - self.target[0]) + abs(pos[1] - self.target[1])
+
+    #### Smallest f() on the open list, outdated entries are dropped
+    def top(self):
+        open_set = self.open_set
+        while open_set and open_set[0][1] in self.closed:
+            heapq.heappop(open_set)
+        if open_set:
+            return open_set[0][0]
+        return INF
+
+    #### Cells from the source of this side to pos
+    def path_to(self, pos):
+        path = []
+        while pos is not None:
+            path.append(pos)
+            pos = self.parent[pos]
+        path.reverse()
+        return path
+
+
+class BidirectionalAStar:
+    def __init__(self, maze, wall_codes=WALL_CODES):
+        self.rows = len(maze)
+        self.cols = len(maze[0])
+        self.walls = wall_mask(maze, wall_codes)
+        #### Cells expanded by each side during the last search
+        self.expanded_forward = 0
+        self.expanded_backward = 0
+
+    #### Cells expanded by both sides during the last search
+    @property
+    def expanded(self):
+        return self.expanded_forward + self.expanded_backward
+
+    ############################################################
+    #### Shortest path from start to goal, None if unreachable
+    ############################################################
+    def find_path(self, start, goal):
+        self.expanded_forward = 0
+        self.expanded_backward = 0
+        if self.walls[start[0] * self.cols + start[1]] or self.walls[goal[0] * self.cols + goal[1]]:
+            return None
+        if start == goal:
+            return [start]
+
+        forward = Frontier(start, goal)
+        backward = Frontier(goal, start)
+        mu = INF
+        meet = None
+        while True:
+            top_forward = forward.top()
+            top_backward = backward.top()
+            #### Stopping criterion: no open cell can lead to a shorter path
+            if top_forward >= mu or top_backward >= mu:
+                break
+            if len(forward.open_set) <= len(backward.open_set):
+                side, other = forward, backward
+            else:
+                side, other = backward, forward
+
+            current_cost, current = heapq.heappop(side.open_set)
+            side.closed.add(current)
+            side.expanded += 1
+            new_g = side.g[current] + 1
+            for dx, dy in MOVES:
+                new_pos = (current[0] + dx, current[1] + dy)
+                if not (0 <= new_pos[0] < self.rows and 0 <= new_pos[1] < self.cols):
+                    continue
+                if self.walls[new_pos[0] * self.cols + new_pos[1]] or new_pos in side.closed:
+                    continue
+                if new_g < side.g.get(new_pos, INF):
+                    side.g[new_pos] = new_g
+                    side.parent[new_pos] = current
+                    heapq.heappush(side.open_set, (new_g + side.heuristic(new_pos), new_pos))
+                    #### Both sides have reached this cell: a path through it
+                    if new_pos in other.g and new_g + other.g[new_pos] < mu:
+                        mu = new_g + other.g[new_pos]
+                        meet = new_pos
+
+        self.expanded_forward = forward.expanded
+        self.expanded_backward = backward.expanded
+        if meet is None:
+            return None
+        path = forward.path_to(meet)
+        back = backward.path_to(meet)
+        back.reverse()
+        return path + back[1:]
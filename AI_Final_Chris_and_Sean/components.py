@@ -0,0 +1,242 @@
+########################################################
+#### Connected-component labels of the open cells.
+#### A goal that is not connected to the start (a sealed
+#### room, a cell out of the hospital) makes A* search the
+#### start's whole region before it gives up. With the
+#### labels the planner rejects it at once.
+####
+#### The first labels come from a vectorised union-find:
+#### every run of open cells along a row is one node, and
+#### every pass over the pairs of runs that touch hooks the
+#### larger root onto the smaller one and lets every run
+#### jump to its root, until no pair joins two roots. A
+#### few NumPy passes instead of a Python flood fill over
+#### every cell.
+####
+#### Labels are kept up to date when a cell toggles:
+####   - a cell opens: the components around it are joined
+####     with a union-find over the labels, no cell changes
+####   - a cell closes: its component may have split. A BFS
+####     runs from all its open neighbours at once, one cell
+####     per search in turn, and stops as soon as they have
+####     all met, which is the usual case. A search that runs
+####     out of cells first has found a part that split off,
+####     only that part gets a new label. When the searches
+####     grow past FILL_LIMIT cells the component is labelled
+####     again with label_components instead.
+#### AI, Spring 2024
+########################################################
+import numpy as np
+
+#### Label of a wall cell
+NO_COMPONENT = -1
+
+#### E, W, S and N, same order as find_path
+MOVES = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+#### Cells the searches of closed() may visit before the whole
+#### component is labelled again in NumPy
+FILL_LIMIT = 1 << 15
+
+
+############################################################
+#### Component label of every open cell as a flat int array,
+#### NO_COMPONENT for walls, and the number of components.
+#### Labels are numbered in the order of their first cell.
+#### With keys (one int per cell, shaped like the maze) a
+#### cell only joins neighbours with the same key.
+############################################################
+def label_components(walls, rows, cols, keys=None):
+    open_cells = np.frombuffer(bytes(walls), dtype=np.uint8).reshape(rows, cols) == 0
+    open_flat = open_cells.ravel()
+    #### Every run of open cells (of one key) along a row is one node
+    starts = open_cells.copy()
+    starts[:, 1:] &= ~open_cells[:, :-1]
+    if keys is not None:
+        keys = np.asarray(keys).reshape(rows, cols)
+        starts[:, 1:] |= open_cells[:, 1:] & (keys[:, 1:] != keys[:, :-1])
+    run = np.cumsum(starts.ravel(), dtype=np.int32) - 1
+    runs = int(starts.sum())
+    if runs == 0:
+        return np.full(rows * cols, NO_COMPONENT, dtype=np.int32), 0
+    #### Runs joined by a pair of open cells, one above the other
+    touching = open_cells[:-1, :] & open_cells[1:, :]
+    if keys is not None:
+        touching &= keys[:-1, :] == keys[1:, :]
+    down = np.flatnonzero(touching.ravel())
+    a = run[down]
+    b = run[down + cols]
+
+    root = np.arange(runs, dtype=np.int32)
+    while len(a):
+        root_a = root[a]
+        root_b = root[b]
+        join = root_a != root_b
+        a, b, root_a, root_b = a[join], b[join], root_a[join], root_b[join]
+        #### Hook the larger root onto the smaller, roots only decrease
+        np.minimum.at(root, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+        #### Every run jumps to its root
+        while True:
+            jumped = root[root]
+            if np.array_equal(jumped, root):
+                break
+            root = jumped
+
+    #### Roots are numbered in cell order
+    is_root = root == np.arange(runs, dtype=np.int32)
+    number = np.cumsum(is_root, dtype=np.int32) - 1
+    labels = np.where(open_flat, number[root[run]], NO_COMPONENT)
+    return labels, int(is_root.sum())
+
+
+class ComponentIndex:
+    def __init__(self, walls, rows, cols):
+        self.walls = walls
+        self.rows = rows
+        self.cols = cols
+        labels, count = label_components(walls, rows, cols)
+        self.label = labels.tolist()
+        #### Union-find parent of every label
+        self.parent = list(range(count))
+
+    def new_label(self):
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    #### Root label of a label, with path halving
+    def find(self, label):
+        parent = self.parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    #### Open neighbours of a flat cell index
+    def neighbours(self, i):
+        x, y = divmod(i, self.cols)
+        for dx, dy in MOVES:
+            new_x = x + dx
+            new_y = y + dy
+            if 0 <= new_x < self.rows and 0 <= new_y < self.cols:
+                new = new_x * self.cols + new_y
+                if not self.walls[new]:
+                    yield new
+
+    #### Component of a cell, NO_COMPONENT for walls
+    def component(self, pos):
+        label = self.label[pos[0] * self.cols + pos[1]]
+        if label == NO_COMPONENT:
+            return NO_COMPONENT
+        return self.find(label)
+
+    ############################################################
+    #### Both cells are open and a path joins them
+    ############################################################
+    def connected(self, a, b):
+        label = self.component(a)
+        return label != NO_COMPONENT and label == self.component(b)
+
+    ############################################################
+    #### A cell was opened: join the components around it
+    ############################################################
+    def opened(self, pos):
+        i = pos[0] * self.cols + pos[1]
+        roots = {self.find(self.label[n]) for n in self.neighbours(i)}
+        if not roots:
+            self.label[i] = self.new_label()
+            return
+        root = roots.pop()
+        for other in roots:
+            self.parent[other] = root
+        self.label[i] = root
+
+    ############################################################
+    #### A cell was closed: its component may have split. One
+    #### BFS per open neighbour, taking turns one cell at a
+    #### time per group of searches that have met. A group that
+    #### runs out of cells is a part that split off and gets a
+    #### new label. Once one group is left, it keeps the old one.
+    ############################################################
+    def closed(self, pos):
+        i = pos[0] * self.cols + pos[1]
+        root = self.find(self.label[i])
+        self.label[i] = NO_COMPONENT
+        starts = list(self.neighbours(i))
+        if len(starts) < 2:
+            return
+        #### Cells reached by each search, also its queue from head[k] on
+        seen = [[start] for start in starts]
+        head = [0] * len(starts)
+        owner = {start: k for k, start in enumerate(starts)}
+        #### Searches that met, a tiny union-find over the searches
+        group = list(range(len(starts)))
+
+        def find_group(k):
+            while group[k] != k:
+                k = group[k]
+            return k
+
+        active = set(range(len(starts)))
+        visited = len(starts)
+        while len(active) > 1:
+            for g in list(active):
+                if g not in active:
+                    continue
+                members = [k for k in range(len(starts)) if find_group(k) == g and head[k] < len(seen[k])]
+                if not members:
+                    #### Split off: new label for every cell of the group
+                    label = self.new_label()
+                    for k in range(len(starts)):
+                        if find_group(k) == g:
+                            for cell in seen[k]:
+                                self.label[cell] = label
+                    active.discard(g)
+                    continue
+                k = members[0]
+                current = seen[k][head[k]]
+                head[k] += 1
+                for new in self.neighbours(current):
+                    other = owner.get(new)
+                    if other is None:
+                        owner[new] = k
+                        seen[k].append(new)
+                        visited += 1
+                    elif find_group(other) != g:
+                        #### Two searches met, their groups are one
+                        merged = find_group(other)
+                        group[merged] = g
+                        active.discard(merged)
+                if visited > FILL_LIMIT:
+                    self.relabel(root)
+                    return
+
+    ############################################################
+    #### Label the cells of component root again in NumPy, for
+    #### a split too big to follow one cell at a time
+    ############################################################
+    def relabel(self, root):
+        parent = np.array(self.parent, dtype=np.int64)
+        #### Root of every label, by jumping until nothing changes
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+        labels = np.array(self.label, dtype=np.int64)
+        in_root = labels != NO_COMPONENT
+        in_root[in_root] = parent[labels[in_root]] == root
+        walls = np.where(in_root, 0, 1).astype(np.uint8)
+        parts, count = label_components(walls, self.rows, self.cols)
+        first = len(self.parent)
+        self.parent.extend(range(first, first + count))
+        labels[in_root] = parts[in_root] + first
+        self.label = labels.tolist()
+
+    ############################################################
+    #### Update the labels after walls[i] was changed
+    ############################################################
+    def update(self, pos):
+        if self.walls[pos[0] * self.cols + pos[1]]:
+            self.closed(pos)
+        else:
+            self.opened(pos)
@@ -0,0 +1,234 @@
+########################################################
+#### Weighted cost map for the hospital floor.
+#### find_path charges 1 for every step, so a route
+#### through the Isolation Ward or the Burn Ward looks as
+#### good as one around it. Here moving onto a cell costs
+#### that cell's cost, a whole number taken from its ward
+#### (WARD_COSTS, 1 for wards not listed). The weight of
+#### a ward can be changed, and single cells such as busy
+#### hallways can get their own cost on top.
+####
+#### CostMapSearch is A* on these costs with a radix heap
+#### as open list (see openlist.py), which only needs
+#### whole, non-negative priorities. h() is the Manhattan
+#### distance times the cheapest cell cost: every step
+#### costs at least that much, so h() never overestimates
+#### and stays consistent. With every cost 0 it is
+#### Dijkstra's algorithm. Like Planner, it reads h() from
+#### a cached field only on small maps.
+####
+#### The version of the costs is the sum of a 64-bit hash
+#### of every (cell, cost), so set_cell_cost only takes out
+#### the old cost of its cell and adds the new one, and the
+#### same costs always get the same version.
+#### AI, Spring 2024
+########################################################
+from array import array
+
+import numpy as np
+
+from grid import WALL_CODES, wall_mask
+from heuristics import HeuristicFields
+from openlist import make_open_list
+from searchstate import SearchState
+
+#### Cost of moving onto a cell of a ward, by hospital code
+#### (Isolation Ward 5, Burn Ward 7), every other ward costs 1
+WARD_COSTS = {
+    5: 5,
+    7: 5,
+}
+
+#### E, W, S and N, same order as find_path
+MOVES = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+#### Versions are sums of cell hashes modulo 2**64
+HASH_MASK = (1 << 64) - 1
+
+
+#### A cost must be a whole number of at least 0
+def check_cost(cost):
+    if int(cost) != cost or cost < 0:
+        raise ValueError("Cell cost must be a whole number of at least 0, got " + str(cost))
+    return int(cost)
+
+
+############################################################
+#### 64-bit hash of every (cell, cost) pair, the splitmix64
+#### finaliser on uint64 arrays (wraps around like in C)
+############################################################
+def cell_hashes(cells, costs):
+    z = np.asarray(cells, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15) + np.asarray(costs, dtype=np.uint64)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+######################################################
+#### Cost of every cell, flat by x * cols + y
+######################################################
+class CostMap:
+    def __init__(self, maze, ward_costs=WARD_COSTS, wall_codes=WALL_CODES):
+        self.maze = maze
+        self.rows = len(maze)
+        self.cols = len(maze[0])
+        self.walls = wall_mask(maze, wall_codes)
+        self.ward_costs = {code: check_cost(cost) for code, cost in ward_costs.items()}
+        #### Cells with their own cost, (x, y) -> cost
+        self.cell_costs = {}
+        self.costs = array('q')
+        self.min_cost = 1
+        #### Open cells that cost min_cost
+        self.cheapest = 0
+        #### Sum of cell_hashes of every cell, the version is its hex
+        self.cost_hash = 0
+        self.version = None
+        self.build()
+
+    ############################################################
+    #### Cost of every cell from the ward costs, then the cells
+    #### with their own cost. Walls keep their ward's cost but
+    #### are never entered.
+    ############################################################
+    def build(self):
+        ward_costs = self.ward_costs
+        maze, cols = self.maze, self.cols
+        self.costs = array('q', [ward_costs.get(int(maze[x][y]), 1) for x in range(self.rows) for y in range(cols)])
+        for (x, y), cost in self.cell_costs.items():
+            self.costs[x * cols + y] = cost
+        costs = np.frombuffer(self.costs, dtype=np.int64)
+        self.cost_hash = int(cell_hashes(np.arange(len(costs)), costs).sum(dtype=np.uint64))
+        self.update()
+
+    #### Cheapest open cell and the version of the costs
+    def update(self):
+        costs = np.frombuffer(self.costs, dtype=np.int64)
+        open_cells = np.frombuffer(bytes(self.walls), dtype=np.uint8) == 0
+        open_costs = costs[open_cells]
+        self.min_cost = int(open_costs.min()) if len(open_costs) else 1
+        self.cheapest = int((open_costs == self.min_cost).sum())
+        self.version = "%016x" % self.cost_hash
+
+    #### New cost of every cell of a ward
+    def set_ward_cost(self, code, cost):
+        self.ward_costs[code] = check_cost(cost)
+        self.build()
+
+    ############################################################
+    #### Own cost of one cell, e.g. a busy hallway. None goes
+    #### back to the cost of its ward. Only that cell, the
+    #### version and maybe the cheapest cost change.
+    ############################################################
+    def set_cell_cost(self, pos, cost):
+        x, y = pos
+        i = x * self.cols + y
+        if cost is None:
+            self.cell_costs.pop(pos, None)
+            new = self.ward_costs.get(int(self.maze[x][y]), 1)
+        else:
+            new = self.cell_costs[pos] = check_cost(cost)
+        old = self.costs[i]
+        self.costs[i] = new
+        old_hash, new_hash = cell_hashes([i, i], [old, new]).tolist()
+        self.cost_hash = (self.cost_hash - old_hash + new_hash) & HASH_MASK
+        self.version = "%016x" % self.cost_hash
+        if self.walls[i] or new == old:
+            return
+        if new < self.min_cost:
+            self.min_cost = new
+            self.cheapest = 1
+            return
+        if new == self.min_cost:
+            self.cheapest += 1
+        elif old == self.min_cost:
+            self.cheapest -= 1
+            if self.cheapest == 0:
+                self.update()
+
+    def cost(self, pos):
+        return self.costs[pos[0] * self.cols + pos[1]]
+
+    #### Cost of a path: every cell after the first one
+    def path_cost(self, path):
+        return sum(self.cost(pos) for pos in path[1:])
+
+
+class CostMapSearch:
+    def __init__(self, maze, ward_costs=WARD_COSTS, open_list="radix", wall_codes=WALL_CODES):
+        self.costs = CostMap(maze, ward_costs, wall_codes)
+        self.rows = self.costs.rows
+        self.cols = self.costs.cols
+        self.walls = self.costs.walls
+        self.open_list = open_list
+        self.state = SearchState(self.rows * self.cols)
+        #### Unit Manhattan fields, scaled by the cheapest cost per search
+        self.heuristics = HeuristicFields(self.rows, self.cols)
+        #### Open list of the last search, it holds the counters
+        self.last_search = None
+        #### Cells expanded during the last search
+        self.expanded = 0
+
+    ############################################################
+    #### Cheapest path from start to goal, None if unreachable
+    ############################################################
+    def find_path(self, start, goal):
+        cols, rows, walls = self.cols, self.rows, self.walls
+        costs = self.costs.costs
+        min_cost = self.costs.min_cost
+        state = self.state
+        self.expanded = 0
+        start_i = start[0] * cols + start[1]
+        goal_i = goal[0] * cols + goal[1]
+        if walls[start_i] or walls[goal_i]:
+            return None
+
+        state.new_search()
+        g, stamp, closed, epoch = state.g, state.stamp, state.closed, state.epoch
+        h = self.heuristics.lookup(goal)
+        goal_x, goal_y = goal
+        start_h = (abs(start[0] - goal_x) + abs(start[1] - goal_y)) * min_cost
+        state.set(start_i, 0, start_h, -1)
+        open_set = make_open_list(self.open_list, integral=True)
+        self.last_search = open_set
+        open_set.push(start_h, start_i)
+
+        while len(open_set):
+            current_f, current = open_set.pop()
+            if closed[current] == epoch:
+                open_set.stale += 1
+                continue
+            closed[current] = epoch
+            self.expanded += 1
+            if current == goal_i:
+                return [divmod(i, cols) for i in state.path_to(goal_i)]
+
+            x, y = divmod(current, cols)
+            current_g = g[current]
+            for dx, dy in MOVES:
+                new_x = x + dx
+                new_y = y + dy
+                if 0 <= new_x < rows and 0 <= new_y < cols:
+                    new = new_x * cols + new_y
+                    if walls[new]:
+                        continue
+                    if closed[new] == epoch:
+                        open_set.closed_skips += 1
+                        continue
+                    new_g = current_g + costs[new]
+                    if stamp[new] != epoch or new_g < g[new]:
+                        if h is None:
+                            new_f = new_g + (abs(new_x - goal_x) + abs(new_y - goal_y)) * min_cost
+                        else:
+                            new_f = new_g + h[new] * min_cost
+                        state.set(new, new_g, new_f, current)
+                        open_set.push(new_f, new)
+        return None
+
+    def path_cost(self, path):
+        return self.costs.path_cost(path)
+
+    #### The planner blocked or opened a cell, the cheapest cost may change
+    def rebuild(self):
+        self.costs.walls = self.walls
+        self.costs.update()
@@ -0,0 +1,157 @@
+########################################################
+#### Hospital floor and delivery destinations.
+#### The floor, the ward priorities and the checks of the
+#### typed in destinations, kept apart from the Tk drawing
+#### in AI_Final.py so the service and its worker
+#### processes can import them without a display.
+#### AI, Spring 2024
+########################################################
+import os
+import re
+from floormap import load_floor
+
+
+############################################################
+#### Hospital matrix representation
+#### -1 - Out of Hospital
+#### 0  - Hallway
+#### 1  - Maternity Ward
+#### 2  - General Ward
+#### 3  - Emergency
+#### 4  - Admissions
+#### 5  - Isolation Ward
+#### 6  - Oncology
+#### 7  - Burn Ward
+#### 8  - ICU
+#### 9  - Surgical Ward
+#### 10 - Hematology 
+#### 11 - Pediatric Ward
+#### 12 - Medical Ward
+#### 13 - Wall
+####
+#### The map is read from hospital.csv next to this file.
+#### AI_Final.py takes another .csv or .flr floor file as
+#### its first argument and loads it with loadHospital.
+############################################################
+hospitalFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hospital.csv")
+hospital = load_floor(hospitalFile)
+maze = hospital.floor(0)
+
+
+############################################################
+#### Use another floor file for the checks and priorities
+############################################################
+def loadHospital(path):
+    global hospitalFile, hospital, maze
+    hospitalFile = path
+    hospital = load_floor(path)
+    maze = hospital.floor(0)
+    return hospital
+
+
+#Store the priority of each ward for lookup
+priority5 = [8,6,3,7]
+priority4 = [9,1]
+priority3 = [10,11]
+priority2 = [12,2]
+priority1 = [4,5]
+
+#Custom sort to group rooms of same priority within the same ward
+def groupWards(dest):
+    return maze[dest[0]][dest[1]]
+
+#Split the destination list into priority tiers, highest first, each grouped by ward
+def findPriorityTiers(destList):
+
+    #Lists to store the locations with the same priority
+    priority5Dest = []
+    priority4Dest = []
+    priority3Dest = []
+    priority2Dest = []
+    priority1Dest = []
+
+    #Group by Priority
+    for dest in destList:
+        if maze[dest[0]][dest[1]] in priority5:
+            priority5Dest.append(dest)
+        elif maze[dest[0]][dest[1]] in priority4:
+            priority4Dest.append(dest)
+        elif maze[dest[0]][dest[1]] in priority3:
+            priority3Dest.append(dest)
+        elif maze[dest[0]][dest[1]] in priority2:
+            priority2Dest.append(dest)
+        elif maze[dest[0]][dest[1]] in priority1:
+            priority1Dest.append(dest)
+        else:
+            priority1Dest.append(dest)
+
+    #Group by ward
+    priority5Dest.sort(key = groupWards)
+    priority4Dest.sort(key = groupWards)
+    priority3Dest.sort(key = groupWards)
+    priority2Dest.sort(key = groupWards)
+    priority1Dest.sort(key = groupWards)
+
+    return [priority5Dest, priority4Dest, priority3Dest, priority2Dest, priority1Dest]
+
+#Sort the destination list by Priority then group by ward
+def findPriority(destList):
+
+    finalList = []
+
+    #Combine the lists into one
+    for tier in findPriorityTiers(destList):
+        for dest in tier:
+            finalList.append(dest)
+
+    return finalList
+
+
+#Check an input string like (1,1),(2,2) and split it into locations.
+#Returns the list of locations and an error message, which is None for good input
+def parseDestinations(text):
+    text = text.replace(" ","")
+
+    #Regex check for decimals or negative numbers
+    pattern = r'(?:[-.][0-9]+)+'
+    match = re.search(pattern, text)
+    if match:
+        return [], text + " <- Negative or decimal input found, please enter positive numbers only " + match.group()
+
+    #Regex check for letters
+    pattern = r'[a-zA-Z]'
+    match = re.search(pattern, text)
+    if match:
+        return [], text + " <- Letter found, please enter numbers only " + match.group()
+
+    #Extract the cords from the input
+    pattern = r'\(([^\)]+)\)'
+    substrings = re.findall(pattern, text)
+
+    #Split the cords into an x and y to be stored in the list
+    destList = []
+    for string in substrings:
+        splitString = string.split(',')
+        if len(splitString) != 2 or not splitString[0].isdigit() or not splitString[1].isdigit():
+            return [], text + " <- Please enter each location as (row,column)"
+        destList.append((int(splitString[0]), int(splitString[1])))
+
+    return checkDestinations(destList)
+
+#Check there is a start and a goal, and no location out of bounds, in a wall or outside the hospital.
+#Returns the list of locations and an error message, which is None for good input
+def checkDestinations(destList):
+
+    #Check to see there is at least one start and one goal
+    if len(destList) < 2:
+        return [], 'Please enter at least one starting location and one destination'
+
+    for dest in destList:
+        if(not hospital.in_bounds(dest)):
+            return [], 'Please enter a location in the maze'
+        elif(maze[dest[0]][dest[1]] == hospital.wall):
+            return [], 'Please enter a location that is not a wall'
+        elif(maze[dest[0]][dest[1]] == hospital.outside):
+            return [], 'Please enter a location inside the hospital'
+
+    return destList, None
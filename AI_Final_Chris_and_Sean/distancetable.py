@@ -0,0 +1,162 @@
+########################################################
+#### Precomputed distance and next-hop tables.
+#### The hospital maze does not change, so the distance
+#### between two cells can be found once offline. One BFS
+#### is run from every target cell (every open cell, or
+#### only the ward rooms) and two tables are saved:
+####   dist[t, c] - steps from open cell c to target t
+####   hop[t, c]  - direction of the first step from c
+####                towards t (index into MOVES)
+#### The planner opens the .npy files memory-mapped and
+#### answers a query with a lookup plus a next-hop walk.
+####
+#### Tables are built and checked with the wall codes of
+#### their floor (see floormap.py) and are only used by a
+#### Planner on the same walls.
+####
+#### Build the tables for the hospital with:
+####   python distancetable.py [folder] [open|rooms] [floor file]
+#### AI, Spring 2024
+########################################################
+import json
+import os
+import sys
+
+import numpy as np
+
+from floormap import load_floor
+from grid import WALL_CODES, map_hash, wall_mask
+from wavefront import wavefront
+
+#### E, W, S and N, same order as find_path
+MOVES = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+#### Cell is not open or target is not reachable
+UNREACHABLE = -1
+
+
+############################################################
+#### Run the BFS from every target cell and save the tables.
+#### sources is "open" for every cell the robot can use or
+#### "rooms" for ward cells only (codes 1 to 12).
+############################################################
+def build_tables(maze, folder, sources="open", wall_codes=WALL_CODES):
+    rows = len(maze)
+    cols = len(maze[0])
+    walls = wall_mask(maze, wall_codes)
+
+    #### Column of every open cell in the tables
+    cells = [i for i in range(rows * cols) if not walls[i]]
+    column = np.full(rows * cols, UNREACHABLE, dtype=np.int32)
+    column[cells] = np.arange(len(cells), dtype=np.int32)
+
+    if sources == "open":
+        targets = cells
+    elif sources == "rooms":
+        targets = [i for i in cells if 1 <= maze[i // cols][i % cols] <= 12]
+    else:
+        raise ValueError("Unknown sources: " + str(sources))
+    row_of = np.full(rows * cols, UNREACHABLE, dtype=np.int32)
+    row_of[targets] = np.arange(len(targets), dtype=np.int32)
+
+    #### Each row is one wavefront BFS (see wavefront.py) cut down to the open cells
+    grid = np.frombuffer(bytes(walls), dtype=np.uint8).reshape(rows, cols).astype(bool)
+    open_cells = np.array(cells, dtype=np.int64)
+    dist = np.empty((len(targets), len(cells)), dtype=np.int32)
+    hop = np.empty((len(targets), len(cells)), dtype=np.int8)
+    for t, target in enumerate(targets):
+        dist_grid, hop_grid = wavefront(grid, divmod(target, cols))
+        dist[t] = dist_grid.ravel()[open_cells]
+        hop[t] = hop_grid.ravel()[open_cells]
+
+    os.makedirs(folder, exist_ok=True)
+    np.save(os.path.join(folder, "column.npy"), column)
+    np.save(os.path.join(folder, "row_of.npy"), row_of)
+    np.save(os.path.join(folder, "dist.npy"), dist)
+    np.save(os.path.join(folder, "hop.npy"), hop)
+    with open(os.path.join(folder, "meta.json"), "w") as f:
+        json.dump({"rows": rows, "cols": cols, "hash": map_hash(maze, wall_codes), "sources": sources, "wall_codes": list(wall_codes)}, f)
+
+
+######################################################
+#### Read-only view of saved tables. The arrays are
+#### memory-mapped, so opening them is instant and the
+#### pages are shared between processes. version is the
+#### hash of the walls they were built on.
+######################################################
+class DistanceTable:
+    def __init__(self, folder, maze=None, wall_codes=WALL_CODES):
+        with open(os.path.join(folder, "meta.json")) as f:
+            meta = json.load(f)
+        if maze is not None and meta["hash"] != map_hash(maze, wall_codes):
+            raise ValueError("Distance tables in " + folder + " were built for a different maze")
+        self.rows = meta["rows"]
+        self.cols = meta["cols"]
+        self.sources = meta["sources"]
+        self.version = meta["hash"]
+        self.column = np.load(os.path.join(folder, "column.npy"), mmap_mode="r")
+        self.row_of = np.load(os.path.join(folder, "row_of.npy"), mmap_mode="r")
+        self.dist = np.load(os.path.join(folder, "dist.npy"), mmap_mode="r")
+        self.hop = np.load(os.path.join(folder, "hop.npy"), mmap_mode="r")
+
+    ############################################################
+    #### The tables can answer a query when either end is a
+    #### target and the other end is an open cell
+    ############################################################
+    def covers(self, start, goal):
+        a = start[0] * self.cols + start[1]
+        b = goal[0] * self.cols + goal[1]
+        if self.column[a] == UNREACHABLE or self.column[b] == UNREACHABLE:
+            return False
+        return self.row_of[a] != UNREACHABLE or self.row_of[b] != UNREACHABLE
+
+    ############################################################
+    #### Steps from start to goal, None if not reachable.
+    #### Moves are symmetric so either end can be the target.
+    ############################################################
+    def distance(self, start, goal):
+        a = start[0] * self.cols + start[1]
+        b = goal[0] * self.cols + goal[1]
+        if self.row_of[b] != UNREACHABLE:
+            d = int(self.dist[self.row_of[b], self.column[a]])
+        else:
+            d = int(self.dist[self.row_of[a], self.column[b]])
+        if d == UNREACHABLE:
+            return None
+        return d
+
+    ############################################################
+    #### Path from start to goal by following the next hops,
+    #### None if not reachable
+    ############################################################
+    def path(self, start, goal):
+        if self.distance(start, goal) is None:
+            return None
+        b = goal[0] * self.cols + goal[1]
+        if self.row_of[b] != UNREACHABLE:
+            return self.walk(start, goal)
+        #### Only the start is a target: walk back from the goal
+        path = self.walk(goal, start)
+        path.reverse()
+        return path
+
+    #### Follow the next hop of every cell from pos until the target
+    def walk(self, pos, target):
+        hop = self.hop[self.row_of[target[0] * self.cols + target[1]]]
+        column = self.column
+        cols = self.cols
+        path = [pos]
+        while pos != target:
+            dx, dy = MOVES[hop[column[pos[0] * cols + pos[1]]]]
+            pos = (pos[0] + dx, pos[1] + dy)
+            path.append(pos)
+        return path
+
+
+if __name__ == "__main__":
+    folder = sys.argv[1] if len(sys.argv) > 1 else "tables"
+    sources = sys.argv[2] if len(sys.argv) > 2 else "open"
+    floorFile = sys.argv[3] if len(sys.argv) > 3 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "hospital.csv")
+    floor = load_floor(floorFile)
+    build_tables(floor.floor(0), folder, sources, floor.wall_codes)
+    print("Saved distance tables for", sources, "cells to", folder)
@@ -0,0 +1,183 @@
+########################################################
+#### Incremental replanning with D* Lite.
+#### Hallway cells get blocked for a while by beds, carts
+#### or cleaning. Rerunning find_path from scratch throws
+#### the whole search tree away. D* Lite searches from the
+#### goal back to the robot and keeps its g() and rhs()
+#### values, so after a change only the cells whose
+#### distance to the goal changed are expanded again.
+####
+#### Moving onto a cell costs that cell's cost (1 unless
+#### changed). A blocked cell can not be entered or left.
+#### Costs may not drop below 1 so Manhattan distance
+#### stays an admissible heuristic.
+#### AI, Spring 2024
+########################################################
+import heapq
+
+from grid import WALL_CODES, wall_mask
+
+INF = float("inf")
+
+#### E, W, S and N, same order as find_path
+MOVES = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+class DStarLite:
+    def __init__(self, maze, start, goal, wall_codes=WALL_CODES):
+        self.rows = len(maze)
+        self.cols = len(maze[0])
+        self.blocked = wall_mask(maze, wall_codes)
+        #### Cell costs other than 1
+        self.cost = {}
+        self.start = start
+        self.goal = goal
+        self.g = {}
+        self.rhs = {goal: 0}
+        #### Key modifier, grows by h(last, start) every time the robot moves
+        self.km = 0
+        self.last = start
+        #### Open list: heap of (key, cell) plus the current key of every open cell
+        self.heap = []
+        self.open = {}
+        #### Cells expanded by the last call of compute_shortest_path
+        self.expanded = 0
+        self.insert(goal, self.key(goal))
+
+    def heuristic(self, a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def key(self, s):
+        m = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (m + self.heuristic(self.start, s) + self.km, m)
+
+    def insert(self, s, key):
+        self.open[s] = key
+        heapq.heappush(self.heap, (key, s))
+
+    ############################################################
+    #### Smallest key on the open list. Entries whose key is
+    #### no longer the cell's current key are thrown away.
+    ############################################################
+    def top(self):
+        while self.heap:
+            key, s = self.heap[0]
+            if self.open.get(s) == key:
+                return key, s
+            heapq.heappop(self.heap)
+        return (INF, INF), None
+
+    #### Open neighbours of a cell
+    def neighbours(self, s):
+        for dx, dy in MOVES:
+            x = s[0] + dx
+            y = s[1] + dy
+            if 0 <= x < self.rows and 0 <= y < self.cols and not self.blocked[x * self.cols + y]:
+                yield (x, y)
+
+    #### Cost of moving from a to its neighbour b
+    def move_cost(self, a, b):
+        if self.blocked[a[0] * self.cols + a[1]] or self.blocked[b[0] * self.cols + b[1]]:
+            return INF
+        return self.cost.get(b, 1)
+
+    ############################################################
+    #### Recompute rhs() of s from its neighbours and put s on
+    #### the open list when it is inconsistent (g() != rhs())
+    ############################################################
+    def update_vertex(self, s):
+        if s != self.goal:
+            best = INF
+            for n in self.neighbours(s):
+                best = min(best, self.move_cost(s, n) + self.g.get(n, INF))
+            self.rhs[s] = best
+        if s in self.open:
+            del self.open[s]
+        if self.g.get(s, INF) != self.rhs.get(s, INF):
+            self.insert(s, self.key(s))
+
+    ############################################################
+    #### Expand inconsistent cells until the robot's cell is
+    #### consistent and nothing on the open list can improve it
+    ############################################################
+    def compute_shortest_path(self):
+        self.expanded = 0
+        while True:
+            top_key, u = self.top()
+            if u is None:
+                break
+            if top_key >= self.key(self.start) and self.rhs.get(self.start, INF) == self.g.get(self.start, INF):
+                break
+            heapq.heappop(self.heap)
+            del self.open[u]
+            self.expanded += 1
+            new_key = self.key(u)
+            if top_key < new_key:
+                self.insert(u, new_key)
+            elif self.g.get(u, INF) > self.rhs.get(u, INF):
+                self.g[u] = self.rhs[u]
+                for n in self.neighbours(u):
+                    self.update_vertex(n)
+            else:
+                self.g[u] = INF
+                self.update_vertex(u)
+                for n in self.neighbours(u):
+                    self.update_vertex(n)
+
+    ############################################################
+    #### Change cells: changes maps (x, y) to a new cost, or to
+    #### None to block the cell. Only the changed cells and
+    #### their neighbours are put back on the open list.
+    ############################################################
+    def update_cells(self, changes):
+        touched = set()
+        for cell, cost in changes.items():
+            i = cell[0] * self.cols + cell[1]
+            if cost is None:
+                self.blocked[i] = 1
+            else:
+                if cost < 1:
+                    raise ValueError("Cell cost must be at least 1, got " + str(cost))
+                self.blocked[i] = 0
+                if cost == 1:
+                    self.cost.pop(cell, None)
+                else:
+                    self.cost[cell] = cost
+            touched.add(cell)
+            for dx, dy in MOVES:
+                x = cell[0] + dx
+                y = cell[1] + dy
+                if 0 <= x < self.rows and 0 <= y < self.cols:
+                    touched.add((x, y))
+        for cell in touched:
+            self.update_vertex(cell)
+        self.compute_shortest_path()
+
+    ############################################################
+    #### The robot moved along the path to pos
+    ############################################################
+    def move_to(self, pos):
+        self.km += self.heuristic(self.last, pos)
+        self.last = pos
+        self.start = pos
+
+    ############################################################
+    #### Cost of the current shortest path, inf if unreachable
+    ############################################################
+    def path_cost(self):
+        return self.g.get(self.start, INF)
+
+    ############################################################
+    #### Current shortest path from the robot to the goal,
+    #### None when the goal can not be reached
+    ############################################################
+    def find_path(self):
+        self.compute_shortest_path()
+        if self.g.get(self.start, INF) == INF:
+            return None
+        path = [self.start]
+        s = self.start
+        while s != self.goal:
+            s = min(self.neighbours(s), key=lambda n: self.move_cost(s, n) + self.g.get(n, INF))
+            path.append(s)
+        return path
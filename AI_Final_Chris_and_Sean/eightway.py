@@ -0,0 +1,173 @@
+########################################################
+#### A* with 8-neighbour moves.
+#### EASTAR and EGBFS build a NumPy array of the eight
+#### moves and shuffle it on every expansion, and charge a
+#### diagonal step 1 like a straight one. Here:
+####   - the wall mask gets a border of walls, so every
+####     neighbour is the cell index plus a fixed offset
+####     from a table built once, no bounds checks
+####   - a straight move costs 1 and a diagonal sqrt 2,
+####     with the octile distance as heuristic, read from
+####     a cached field on small maps (see heuristics.py)
+####   - corner cutting is a policy:
+####       "never"  both side cells must be open (default)
+####       "single" one open side cell is enough
+####       "always" only the target cell must be open
+####   - ties on f() go to the smaller h(), then either in
+####     push order or, with a seed, in a random order that
+####     is the same for every run with that seed
+#### The HW4 scripts keep their own rules through the
+#### options: a diagonal costs 1 (diagonal_cost), h() is
+#### the Euclidean distance (heuristic), any diagonal to
+#### an open cell is allowed ("always") and EGBFS ranks
+#### by h() alone (g_weight 0).
+#### It is the "eightway" engine of Planner.
+#### AI, Spring 2024
+########################################################
+import math
+import random
+
+from grid import WALL_CODES, wall_mask
+from heuristics import HeuristicFields
+from openlist import HeapOpenList
+from searchstate import SearchState
+
+SQRT2 = math.sqrt(2)
+
+#### E, W, S, N, then the diagonals SE, NW, SW, NE
+MOVES = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)]
+
+CORNER_POLICIES = ("never", "single", "always")
+
+#### h() from the row and column distances, when there is no field
+DISTANCES = {
+    "manhattan": lambda dx, dy: dx + dy,
+    "euclidean": math.hypot,
+    "octile": lambda dx, dy: max(dx, dy) + (SQRT2 - 1) * min(dx, dy),
+}
+
+
+class EightWayAStar:
+    def __init__(self, maze, corner_cutting="never", seed=None, wall_codes=WALL_CODES, diagonal_cost=SQRT2, heuristic="octile", g_weight=1):
+        if corner_cutting not in CORNER_POLICIES:
+            raise ValueError("Unknown corner cutting policy: " + str(corner_cutting))
+        if heuristic not in DISTANCES:
+            raise ValueError("Unknown heuristic: " + str(heuristic))
+        self.rows = len(maze)
+        self.cols = len(maze[0])
+        self.corner_cutting = corner_cutting
+        self.seed = seed
+        self.diagonal_cost = diagonal_cost
+        self.distance = DISTANCES[heuristic]
+        #### f = g_weight * g + h, 0 ranks by h() alone (greedy best-first)
+        self.g_weight = g_weight
+        #### Flat wall mask, shared with the Planner
+        self.walls = wall_mask(maze, wall_codes)
+        #### Columns of the padded grid, cell (x, y) is (x + 1) * width + y + 1
+        self.width = self.cols + 2
+        self.padded = bytearray()
+        self.rebuild()
+        self.state = SearchState(len(self.padded))
+        self.neighbours = self.neighbour_table()
+        #### Fields over the padded grid, keyed by the padded goal
+        self.heuristics = HeuristicFields(self.rows + 2, self.width, heuristic)
+        #### Open list of the last search, it holds the counters
+        self.last_search = None
+        #### Cells expanded during the last search
+        self.expanded = 0
+
+    #### Walls with a border of walls around them, again after walls changed
+    def rebuild(self):
+        width, cols = self.width, self.cols
+        self.padded = bytearray([1]) * (width * (self.rows + 2))
+        for x in range(self.rows):
+            start = (x + 1) * width + 1
+            self.padded[start:start + cols] = self.walls[x * cols:(x + 1) * cols]
+
+    ############################################################
+    #### One (offset, cost, side offsets) entry per move. The
+    #### side cells are the two cells a diagonal passes by.
+    ############################################################
+    def neighbour_table(self):
+        width = self.width
+        table = []
+        for dx, dy in MOVES:
+            if dx and dy:
+                table.append((dx * width + dy, self.diagonal_cost, (dx * width, dy)))
+            else:
+                table.append((dx * width + dy, 1, ()))
+        return table
+
+    def heuristic(self, a, b):
+        return self.distance(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+    #### A diagonal past the side cells is allowed by the policy
+    def can_cut(self, i, sides):
+        if not sides or self.corner_cutting == "always":
+            return True
+        blocked = self.padded[i + sides[0]] + self.padded[i + sides[1]]
+        if self.corner_cutting == "never":
+            return blocked == 0
+        return blocked < 2
+
+    ############################################################
+    #### Cheapest path from start to goal, None if unreachable
+    ############################################################
+    def find_path(self, start, goal):
+        width, walls, state = self.width, self.padded, self.state
+        distance, g_weight = self.distance, self.g_weight
+        self.expanded = 0
+        start_i = (start[0] + 1) * width + start[1] + 1
+        goal_i = (goal[0] + 1) * width + goal[1] + 1
+        if walls[start_i] or walls[goal_i]:
+            return None
+
+        state.new_search()
+        g, stamp, closed, epoch = state.g, state.stamp, state.closed, state.epoch
+        rng = random.Random(self.seed) if self.seed is not None else None
+        count = 0
+        #### h() of every padded cell, None on maps too big for fields
+        goal_x, goal_y = goal[0] + 1, goal[1] + 1
+        field = self.heuristics.lookup((goal_x, goal_y))
+        h = self.heuristic(start, goal)
+        state.set(start_i, 0, h, -1)
+        #### Priorities are (f, h, tie), the heap orders the tuples
+        open_set = HeapOpenList()
+        self.last_search = open_set
+        open_set.push((h, h, 0), start_i)
+
+        while len(open_set):
+            priority, current = open_set.pop()
+            if closed[current] == epoch:
+                open_set.stale += 1
+                continue
+            closed[current] = epoch
+            self.expanded += 1
+            if current == goal_i:
+                return [((i // width) - 1, (i % width) - 1) for i in state.path_to(goal_i)]
+
+            for offset, cost, sides in self.neighbours:
+                new = current + offset
+                if walls[new]:
+                    continue
+                if closed[new] == epoch:
+                    open_set.closed_skips += 1
+                    continue
+                if sides and not self.can_cut(current, sides):
+                    continue
+                new_g = g[current] + cost
+                if stamp[new] != epoch or new_g < g[new]:
+                    if field is None:
+                        new_x, new_y = divmod(new, width)
+                        new_h = distance(abs(new_x - goal_x), abs(new_y - goal_y))
+                    else:
+                        new_h = field[new]
+                    new_f = g_weight * new_g + new_h
+                    state.set(new, new_g, new_f, current)
+                    count += 1
+                    open_set.push((new_f, new_h, rng.random() if rng else count), new)
+        return None
+
+    #### Cost of a path with straight and diagonal steps
+    def path_cost(self, path):
+        return sum(self.diagonal_cost if a[0] != b[0] and a[1] != b[1] else 1 for a, b in zip(path, path[1:]))
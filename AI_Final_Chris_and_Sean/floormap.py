@@ -0,0 +1,173 @@
+########################################################
+#### Floor maps stored in files instead of a Python list.
+####
+#### Binary floor file (.flr), little endian:
+####   magic "HFLR", version (u16), floors (u16),
+####   rows (u32), cols (u32), wall code (i8),
+####   outside code (i8), legend length (u32),
+####   legend as JSON {"code": "name"},
+####   zero padding up to a multiple of 16 bytes,
+####   floors * rows * cols int8 codes, row by row.
+#### The codes are memory-mapped, so even a map with
+#### millions of cells opens at once and its pages are
+#### shared by every process that opens the same file.
+####
+#### CSV floor file (.csv): one row of codes per line.
+#### Lines starting with # are the header:
+####   # wall=13
+####   # outside=-1
+####   # 1=Maternity Ward      (legend entries)
+#### A blank line starts the next floor.
+####
+#### Convert a CSV floor to a binary floor with:
+####   python floormap.py hospital.csv hospital.flr
+#### AI, Spring 2024
+########################################################
+import json
+import struct
+import sys
+
+import numpy as np
+
+MAGIC = b"HFLR"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIbbI")
+
+
+######################################################
+#### A building of one or more floors of the same size.
+#### grid[floor][x][y] is the code of a cell.
+######################################################
+class FloorMap:
+    def __init__(self, grid, wall=13, outside=-1, legend=None):
+        self.grid = grid
+        self.floors, self.rows, self.cols = grid.shape
+        self.wall = wall
+        self.outside = outside
+        self.legend = legend or {}
+
+    #### Codes the robot can not cross, for wall_mask and the planners
+    @property
+    def wall_codes(self):
+        return (self.outside, self.wall)
+
+    #### One floor as a rows X cols array, usable as a maze
+    def floor(self, index=0):
+        return self.grid[index]
+
+    #### The position is a cell of the map
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols
+
+    #### The cell is a wall or out of the building
+    def is_blocked(self, pos, floor=0):
+        return int(self.grid[floor][pos[0]][pos[1]]) in self.wall_codes
+
+    #### Name of the ward a cell belongs to
+    def name(self, pos, floor=0):
+        return self.legend.get(int(self.grid[floor][pos[0]][pos[1]]), "Unknown")
+
+
+############################################################
+#### Open a .flr or .csv floor file
+############################################################
+def load_floor(path):
+    if path.endswith(".csv"):
+        return load_csv(path)
+    return load_binary(path)
+
+
+############################################################
+#### Read the header of a binary floor file and map its codes
+############################################################
+def load_binary(path):
+    with open(path, "rb") as f:
+        magic, version, floors, rows, cols, wall, outside, legend_length = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(path + " is not a floor file")
+        if version != VERSION:
+            raise ValueError(path + " has unsupported floor file version " + str(version))
+        legend = json.loads(f.read(legend_length).decode("utf-8"))
+    offset = data_offset(legend_length)
+    grid = np.memmap(path, dtype=np.int8, mode="r", offset=offset, shape=(floors, rows, cols))
+    return FloorMap(grid, wall, outside, {int(code): name for code, name in legend.items()})
+
+
+############################################################
+#### Write a binary floor file. grid is a list of floors or
+#### a single floor (rows X cols).
+############################################################
+def save_binary(path, grid, wall=13, outside=-1, legend=None):
+    grid = np.asarray(grid, dtype=np.int8)
+    if grid.ndim == 2:
+        grid = grid[np.newaxis]
+    floors, rows, cols = grid.shape
+    legend_bytes = json.dumps({str(code): name for code, name in (legend or {}).items()}).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, floors, rows, cols, wall, outside, len(legend_bytes)))
+        f.write(legend_bytes)
+        f.write(b"\0" * (data_offset(len(legend_bytes)) - HEADER.size - len(legend_bytes)))
+        f.write(np.ascontiguousarray(grid).tobytes())
+
+
+#### The codes start on the first multiple of 16 after the legend
+def data_offset(legend_length):
+    return (HEADER.size + legend_length + 15) // 16 * 16
+
+
+############################################################
+#### Read a CSV floor file. CSV can not be memory-mapped,
+#### convert large maps to a binary floor file once.
+############################################################
+def load_csv(path):
+    wall = 13
+    outside = -1
+    legend = {}
+    floors = [[]]
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("#"):
+                key, sep, value = line[1:].partition("=")
+                key = key.strip()
+                if not sep:
+                    continue
+                if key == "wall":
+                    wall = int(value)
+                elif key == "outside":
+                    outside = int(value)
+                elif key.lstrip("-").isdigit():
+                    legend[int(key)] = value.strip()
+            elif not line:
+                if floors[-1]:
+                    floors.append([])
+            else:
+                floors[-1].append([int(code) for code in line.split(",")])
+    if not floors[-1]:
+        floors.pop()
+    return FloorMap(np.array(floors, dtype=np.int8), wall, outside, legend)
+
+
+############################################################
+#### Write a CSV floor file
+############################################################
+def save_csv(path, grid, wall=13, outside=-1, legend=None):
+    grid = np.asarray(grid, dtype=np.int8)
+    if grid.ndim == 2:
+        grid = grid[np.newaxis]
+    with open(path, "w") as f:
+        f.write("# wall=%d\n" % wall)
+        f.write("# outside=%d\n" % outside)
+        for code, name in (legend or {}).items():
+            f.write("# %d=%s\n" % (code, name))
+        for index, floor in enumerate(grid):
+            if index:
+                f.write("\n")
+            for row in floor:
+                f.write(",".join(str(code) for code in row) + "\n")
+
+
+if __name__ == "__main__":
+    floor_map = load_floor(sys.argv[1])
+    save_binary(sys.argv[2], floor_map.grid, floor_map.wall, floor_map.outside, floor_map.legend)
+    print("Saved", floor_map.floors, "floor(s) of", floor_map.rows, "X", floor_map.cols, "to", sys.argv[2])
@@ -0,0 +1,111 @@
+########################################################
+#### Flow fields for many robots with the same target.
+#### Deliveries keep going to the same places (ICU,
+#### Emergency, Oncology) from different cells. Instead
+#### of one search per robot, one reverse BFS from the
+#### target (see wavefront.py) gives every cell its
+#### distance and its next step, and each robot reads its
+#### next step in O(1). The target is one cell (x, y) or a
+#### whole ward by its code, then a robot heads for the
+#### nearest cell of that ward.
+####
+#### Fields are cached per target for one Planner and are
+#### dropped as soon as the planner's map version changes
+#### (Planner.set_blocked).
+#### AI, Spring 2024
+########################################################
+from collections import OrderedDict
+
+import numpy as np
+
+from wavefront import MOVES, UNREACHABLE, wavefront
+
+#### Fields kept per planner
+CAPACITY = 32
+
+
+######################################################
+#### Distance and next hop of every cell to one target
+######################################################
+class FlowField:
+    def __init__(self, target, dist, hop):
+        self.target = target
+        self.dist = dist
+        self.hop = hop
+
+    #### Steps from pos to the target, None if it can not be reached
+    def distance(self, pos):
+        d = int(self.dist[pos])
+        return None if d == UNREACHABLE else d
+
+    ############################################################
+    #### Next cell from pos towards the target, None when pos is
+    #### on the target or can not reach it
+    ############################################################
+    def next_step(self, pos):
+        k = self.hop[pos]
+        if k == UNREACHABLE:
+            return None
+        dx, dy = MOVES[k]
+        return (pos[0] + dx, pos[1] + dy)
+
+    #### Every cell from pos to the target, None if unreachable
+    def path(self, pos):
+        if self.dist[pos] == UNREACHABLE:
+            return None
+        path = [pos]
+        step = self.next_step(pos)
+        while step is not None:
+            path.append(step)
+            step = self.next_step(step)
+        return path
+
+
+class FlowFields:
+    def __init__(self, planner, capacity=CAPACITY):
+        self.planner = planner
+        self.capacity = capacity
+        self.fields = OrderedDict()
+        #### Map version the cached fields were built on
+        self.version = planner.map_version
+        self.hits = 0
+        self.misses = 0
+
+    ############################################################
+    #### Field of a target: an (x, y) cell or a ward code
+    ############################################################
+    def field(self, target):
+        if self.planner.map_version != self.version:
+            self.fields.clear()
+            self.version = self.planner.map_version
+        field = self.fields.get(target)
+        if field is not None:
+            self.fields.move_to_end(target)
+            self.hits += 1
+            return field
+        self.misses += 1
+        field = self.build(target)
+        self.fields[target] = field
+        while len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
+
+    def build(self, target):
+        planner = self.planner
+        walls = np.frombuffer(bytes(planner.walls), dtype=np.uint8).reshape(planner.rows, planner.cols).astype(bool)
+        if isinstance(target, tuple):
+            seeds = target
+        else:
+            seeds = np.asarray(planner.maze) == target
+        dist, hop = wavefront(walls, seeds)
+        return FlowField(target, dist, hop)
+
+    def next_step(self, pos, target):
+        return self.field(target).next_step(pos)
+
+    def path(self, pos, target):
+        return self.field(target).path(pos)
+
+    #### Drop every field, e.g. after the planner's walls were swapped
+    def clear(self):
+        self.fields.clear()
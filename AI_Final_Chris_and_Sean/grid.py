@@ -0,0 +1,39 @@
+########################################################
+#### Helpers shared by every grid search on a maze.
+#### Cells are numbered x * cols + y.
+#### AI, Spring 2024
+########################################################
+import hashlib
+
+import numpy as np
+
+#### Hospital codes the robot can not cross: out of hospital and wall
+WALL_CODES = (-1, 13)
+
+
+############################################################
+#### Flat wall mask of a maze: 1 for cells whose code is in
+#### wall_codes, 0 for cells the robot can use. The HW4
+#### mazes use wall_codes=(1,). A floor loaded from a
+#### file (floormap.py) is a NumPy array and is masked in
+#### one vectorised pass.
+############################################################
+def wall_mask(maze, wall_codes=WALL_CODES):
+    if isinstance(maze, np.ndarray):
+        return bytearray(np.isin(maze, wall_codes).astype(np.uint8).tobytes())
+    return bytearray(1 if maze[x][y] in wall_codes else 0 for x in range(len(maze)) for y in range(len(maze[0])))
+
+
+############################################################
+#### Short hash of a maze layout. Anything saved for a maze
+#### (tables, cached routes) is only valid for the same hash.
+############################################################
+def map_hash(maze, wall_codes=WALL_CODES):
+    return walls_hash(wall_mask(maze, wall_codes), len(maze), len(maze[0]))
+
+
+#### Same hash straight from a wall mask, e.g. after cells were blocked
+def walls_hash(walls, rows, cols):
+    digest = hashlib.sha1(bytes(walls))
+    digest.update(b"%d,%d" % (rows, cols))
+    return digest.hexdigest()[:16]
@@ -0,0 +1,97 @@
+########################################################
+#### Heuristic fields cached per goal.
+#### A search asks for h() on every push, and the same
+#### cells are scored for the same goals round after
+#### round. A field holds h() of every cell for one goal,
+#### built in one NumPy pass, so the search loop reads
+#### field[i] by flat index (x * cols + y) instead of
+#### calling a method. Fields of the most recently used
+#### goals are kept, the oldest is dropped when the cache
+#### holds more than max_cells cells in total.
+####
+#### A field costs a pass over the whole map, more than
+#### the search of a short leg on a big map. Fields are
+#### used by default only on maps of at most FIELD_CELLS
+#### cells; lookup() returns None otherwise, and the
+#### search works h() out itself.
+####
+#### Kinds: "manhattan", "euclidean" and "octile", each
+#### multiplied by weight (weighted A* uses weight > 1).
+#### Manhattan with a whole weight gives integer fields,
+#### so the bucket open list still works with them.
+#### AI, Spring 2024
+########################################################
+import math
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+SQRT2 = math.sqrt(2)
+
+#### h() of every cell from the row and column distances to the goal
+HEURISTICS = {
+    "manhattan": lambda dx, dy: dx + dy,
+    "euclidean": lambda dx, dy: np.sqrt(dx * dx + dy * dy),
+    "octile": lambda dx, dy: np.maximum(dx, dy) + (SQRT2 - 1) * np.minimum(dx, dy),
+}
+
+#### Cells kept over all cached fields, 8 bytes each
+MAX_CELLS = 1 << 24
+
+#### Largest map that gets fields by default
+FIELD_CELLS = 1 << 16
+
+
+class HeuristicFields:
+    def __init__(self, rows, cols, kind="manhattan", weight=1, max_cells=MAX_CELLS, enabled="auto"):
+        if kind not in HEURISTICS:
+            raise ValueError("Unknown heuristic: " + str(kind))
+        self.rows = rows
+        self.cols = cols
+        self.kind = kind
+        self.weight = weight
+        #### Whole numbers only for Manhattan times a whole weight
+        self.integral = kind == "manhattan" and float(weight).is_integer()
+        self.capacity = max(1, max_cells // (rows * cols))
+        #### "auto" uses fields on maps of at most FIELD_CELLS cells
+        self.enabled = rows * cols <= FIELD_CELLS if enabled == "auto" else bool(enabled)
+        self.fields = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    ############################################################
+    #### h() of every cell for the goal as a flat array
+    ############################################################
+    def field(self, goal):
+        field = self.fields.get(goal)
+        if field is not None:
+            self.fields.move_to_end(goal)
+            self.hits += 1
+            return field
+        self.misses += 1
+        field = self.build(goal)
+        self.fields[goal] = field
+        while len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
+
+    #### Field of the goal when fields are used, else None
+    def lookup(self, goal):
+        if not self.enabled:
+            return None
+        return self.field(goal)
+
+    def build(self, goal):
+        dx = np.abs(np.arange(self.rows) - goal[0])[:, None]
+        dy = np.abs(np.arange(self.cols) - goal[1])[None, :]
+        values = HEURISTICS[self.kind](dx, dy) * self.weight
+        values = np.broadcast_to(values, (self.rows, self.cols))
+        #### array reads are plain Python numbers, NumPy scalars are slow in a loop
+        if self.integral:
+            return array('q', np.ascontiguousarray(values, dtype=np.int64).tobytes())
+        return array('d', np.ascontiguousarray(values, dtype=np.float64).tobytes())
+
+    #### h() of one cell
+    def value(self, pos, goal):
+        return self.field(goal)[pos[0] * self.cols + pos[1]]
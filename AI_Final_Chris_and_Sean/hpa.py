@@ -0,0 +1,347 @@
+########################################################
+#### Hierarchical pathfinding (HPA*) on the ward regions.
+#### A region is a connected block of cells with the same
+#### code inside one CLUSTER_SIZE square, so a ward room
+#### block or a hallway is one region or is split into a
+#### few bounded ones. Where two regions touch they form an
+#### entrance; every entrance gets one portal (its middle)
+#### or two portals (its ends) when it is long.
+####
+#### Built once per maze:
+####   - region labels for every open cell
+####   - the portals and the abstract graph between them:
+####     cost 1 across an entrance, and the cached BFS
+####     distance between the portals of one region,
+####     found for every region at once with NumPy
+#### Each query joins start and goal to the portals of
+#### their regions with a BFS that stops once every portal
+#### is reached, so it never covers more than one region,
+#### runs A* on the small abstract graph and refines only
+#### the abstract edges it is asked for, walking a BFS
+#### tree that is built the first time a portal is used.
+#### expanded counts the abstract nodes, the BFS cells and
+#### the refined cells, so it compares with the cells of
+#### plain A*.
+#### Like every HPA*, paths are close to, but not always,
+#### the shortest.
+#### AI, Spring 2024
+########################################################
+import heapq
+from collections import deque
+
+import numpy as np
+
+from components import NO_COMPONENT, label_components
+from grid import WALL_CODES, wall_mask
+
+#### Entrances longer than this get a portal at both ends
+ENTRANCE_LIMIT = 5
+
+#### Side of the squares regions are cut into
+CLUSTER_SIZE = 10
+
+#### E, W, S and N, same order as find_path
+MOVES = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+############################################################
+#### Runs of crossings between cells a and b, two arrays of
+#### flat cell indices whose rows are the lines the runs go
+#### along. A crossing joins two different regions, a run
+#### keeps the same two regions. Returns the (first, last)
+#### flat position in a of every run, in that order.
+############################################################
+def crossing_runs(region, a, b):
+    region_a = region[a]
+    region_b = region[b]
+    crossing = (region_a != -1) & (region_b != -1) & (region_a != region_b)
+    #### Crossing that goes on the run of the one before it
+    joined = np.zeros_like(crossing)
+    joined[:, 1:] = (crossing[:, 1:] & crossing[:, :-1]
+                     & (region_a[:, 1:] == region_a[:, :-1]) & (region_b[:, 1:] == region_b[:, :-1]))
+    ends = np.zeros_like(crossing)
+    ends[:, :-1] = joined[:, 1:]
+    firsts = np.flatnonzero(crossing & ~joined).tolist()
+    lasts = np.flatnonzero(crossing & ~ends).tolist()
+    return zip(firsts, lasts)
+
+
+class HierarchicalPlanner:
+    def __init__(self, maze, wall_codes=WALL_CODES, cluster_size=CLUSTER_SIZE):
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.rows = len(maze)
+        self.cols = len(maze[0])
+        self.walls = wall_mask(maze, wall_codes)
+        #### Hospital code of every cell, flat like the walls
+        self.codes = np.asarray(maze).ravel().tolist()
+        #### Region label of every cell, -1 for walls
+        self.region = [-1] * (self.rows * self.cols)
+        #### Code of every region
+        self.region_code = []
+        #### Portals (flat cell indices) of every region
+        self.portals = []
+        #### Abstract graph: portal -> {portal: cost}
+        self.graph = {}
+        #### BFS parent trees out of the portals refined so far
+        self.trees = {}
+        #### BFS parent trees out of the start and goal of the last query
+        self.query_trees = {}
+        #### Abstract nodes, BFS cells and refined cells of the last query
+        self.expanded = 0
+        self.rebuild()
+
+    ############################################################
+    #### Build the regions and the abstract graph from the
+    #### current walls, again after walls were changed
+    ############################################################
+    def rebuild(self):
+        self.region = [-1] * (self.rows * self.cols)
+        self.region_code = []
+        self.portals = []
+        self.graph = {}
+        self.trees = {}
+        self.query_trees = {}
+        self.label_regions()
+        self.find_portals()
+        self.link_portals()
+
+    ############################################################
+    #### Label every block of cells that share a code and a
+    #### cluster square, with the union-find of components.py
+    #### keyed on both. Labels go in the order of the first
+    #### cell of each block.
+    ############################################################
+    def label_regions(self):
+        rows, cols, size = self.rows, self.cols, self.cluster_size
+        codes = np.asarray(self.codes, dtype=np.int64).reshape(rows, cols)
+        x, y = np.indices((rows, cols))
+        cluster = (x // size) * (cols // size + 1) + y // size
+        low = int(codes.min())
+        keys = cluster * (int(codes.max()) - low + 1) + codes - low
+        labels, count = label_components(self.walls, rows, cols, keys)
+        self.region = np.where(labels == NO_COMPONENT, -1, labels).tolist()
+        first = np.unique(labels[labels != NO_COMPONENT], return_index=True)[1]
+        self.region_code = [self.codes[i] for i in np.flatnonzero(labels != NO_COMPONENT)[first].tolist()]
+        self.portals = [[] for _ in range(count)]
+
+    ############################################################
+    #### Collect the entrances between regions and place the
+    #### portals. A run of neighbouring crossings between the
+    #### same two regions is one entrance. Runs go down a
+    #### column for crossings to the cell on the right, then
+    #### along a row for crossings to the cell below.
+    ############################################################
+    def find_portals(self):
+        rows, cols = self.rows, self.cols
+        region = np.array(self.region, dtype=np.intp)
+        cells = np.arange(rows * cols).reshape(rows, cols)
+        for a, b in ((cells[:, :-1].T, cells[:, 1:].T), (cells[:-1, :], cells[1:, :])):
+            runs = crossing_runs(region, a, b)
+            a, b = a.ravel().tolist(), b.ravel().tolist()
+            for first, last in runs:
+                if last - first + 1 > ENTRANCE_LIMIT:
+                    chosen = [first, last]
+                else:
+                    chosen = [first + (last - first + 1) // 2]
+                for n in chosen:
+                    self.add_portal(a[n])
+                    self.add_portal(b[n])
+                    self.graph[a[n]][b[n]] = 1
+                    self.graph[b[n]][a[n]] = 1
+
+    def add_portal(self, i):
+        if i not in self.graph:
+            self.graph[i] = {}
+            self.portals[self.region[i]].append(i)
+
+    ############################################################
+    #### Cache the distance between every two portals of a
+    #### region. BFS distances are the same both ways, so
+    #### the BFS out of a portal only has to reach the
+    #### portals after it and the last portal needs none.
+    #### Regions never overlap, so the BFS out of the n-th
+    #### portal of every region runs as one NumPy frontier
+    #### (as in wavefront.py) that never crosses a region
+    #### border. The trees used to refine are built later,
+    #### by portal_tree, for the portals a path goes through.
+    ############################################################
+    def link_portals(self):
+        size = self.rows * self.cols
+        cols = self.cols
+        region = np.array(self.region, dtype=np.intp)
+        cells = np.arange(size)
+        y = cells % cols
+        #### Flat offset of every move and the cells it stays in their region from
+        steps = []
+        for dx, dy in MOVES:
+            offset = dx * cols + dy
+            new = cells + offset
+            same = (y + dy >= 0) & (y + dy < cols) & (new >= 0) & (new < size)
+            same[same] = region[new[same]] == region[same]
+            steps.append((offset, same & (region != -1)))
+
+        linked = [portals for portals in self.portals if len(portals) > 1]
+        graph = self.graph
+        dist = np.full(size, -1, dtype=np.intp)
+        n = 0
+        while linked:
+            frontier = np.array([portals[n] for portals in linked], dtype=np.intp)
+            seen = [frontier]
+            dist[frontier] = 0
+            level = 0
+            while len(frontier):
+                level += 1
+                reached_all = []
+                for offset, same in steps:
+                    reached = frontier[same[frontier]] + offset
+                    reached = reached[dist[reached] == -1]
+                    dist[reached] = level
+                    reached_all.append(reached)
+                frontier = np.concatenate(reached_all)
+                seen.append(frontier)
+            #### Edges in batch order keep every portal's edges in portal order
+            sources = [portals[n] for portals in linked for other in portals[n + 1:]]
+            others = [other for portals in linked for other in portals[n + 1:]]
+            for portal, other, steps_to in zip(sources, others, dist[others].tolist()):
+                if steps_to != -1:
+                    graph[portal][other] = graph[other][portal] = steps_to
+            dist[np.concatenate(seen)] = -1
+            n += 1
+            linked = [portals for portals in linked if len(portals) > n + 1]
+
+    #### BFS parent tree out of a portal over its whole region, cached
+    def portal_tree(self, portal):
+        if portal not in self.trees:
+            self.trees[portal] = self.region_bfs(portal)[1]
+        return self.trees[portal]
+
+    ############################################################
+    #### BFS from a cell that never leaves the cell's region.
+    #### With targets it stops once all of them are reached.
+    ############################################################
+    def region_bfs(self, source, targets=None):
+        cols, region = self.cols, self.region
+        size = len(region)
+        label = region[source]
+        dist = {source: 0}
+        parent = {source: None}
+        left = None if targets is None else set(targets) - {source}
+        queue = deque([source])
+        while queue and left != set():
+            current = queue.popleft()
+            y = current % cols
+            #### Walls have no region, so only the edges of the map are checked
+            for new, inside in ((current + 1, y + 1 < cols), (current - 1, y > 0),
+                                (current + cols, current + cols < size), (current - cols, current >= cols)):
+                if inside and new not in dist and region[new] == label:
+                    dist[new] = dist[current] + 1
+                    parent[new] = current
+                    queue.append(new)
+                    if left is not None:
+                        left.discard(new)
+        return dist, parent
+
+    def heuristic(self, a, b):
+        return abs(a // self.cols - b // self.cols) + abs(a % self.cols - b % self.cols)
+
+    ############################################################
+    #### A* on the abstract graph. Returns the abstract path
+    #### as (x, y) cells from start to goal, or None.
+    ############################################################
+    def find_abstract_path(self, start_pos, goal_pos):
+        cols = self.cols
+        start = start_pos[0] * cols + start_pos[1]
+        goal = goal_pos[0] * cols + goal_pos[1]
+        self.expanded = 0
+        if self.walls[start] or self.walls[goal]:
+            return None
+
+        #### Join start and goal to the portals of their regions
+        start_targets = list(self.portals[self.region[start]])
+        if self.region[goal] == self.region[start]:
+            start_targets.append(goal)
+        start_dist, start_tree = self.region_bfs(start, start_targets)
+        goal_dist, goal_tree = self.region_bfs(goal, self.portals[self.region[goal]])
+        self.expanded += len(start_dist) + len(goal_dist)
+        self.query_trees = {start: start_tree, goal: goal_tree}
+        extra = {start: {}, goal: {}}
+        for portal in self.portals[self.region[start]]:
+            if portal in start_dist:
+                extra[start][portal] = start_dist[portal]
+        for portal in self.portals[self.region[goal]]:
+            if portal in goal_dist:
+                extra.setdefault(portal, {})[goal] = goal_dist[portal]
+        if goal in start_dist:
+            extra[start][goal] = start_dist[goal]
+
+        g = {start: 0}
+        parent = {start: None}
+        closed = set()
+        open_set = [(self.heuristic(start, goal), start)]
+        while open_set:
+            current_cost, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.expanded += 1
+            if current == goal:
+                path = []
+                while current is not None:
+                    path.append(divmod(current, cols))
+                    current = parent[current]
+                path.reverse()
+                return path
+            edges = list(self.graph.get(current, {}).items()) + list(extra.get(current, {}).items())
+            for new, cost in edges:
+                if new in closed:
+                    continue
+                new_g = g[current] + cost
+                if new_g < g.get(new, float("inf")):
+                    g[new] = new_g
+                    parent[new] = current
+                    heapq.heappush(open_set, (new_g + self.heuristic(new, goal), new))
+        return None
+
+    ############################################################
+    #### Cells of one abstract edge from a to b, without a.
+    #### Inside a region the BFS tree of a is walked back
+    #### from b; across an entrance it is a single step.
+    ############################################################
+    def refine_edge(self, a_pos, b_pos):
+        cols = self.cols
+        a = a_pos[0] * cols + a_pos[1]
+        b = b_pos[0] * cols + b_pos[1]
+        if self.region[a] != self.region[b]:
+            return [b_pos]
+        #### a is the start of the last query or a portal, and the
+        #### tree of either reaches every portal of its region
+        tree = self.query_trees.get(a)
+        if tree is None:
+            tree = self.portal_tree(a)
+        cells = []
+        current = b
+        while current != a:
+            cells.append(divmod(current, cols))
+            current = tree[current]
+        cells.reverse()
+        return cells
+
+    ############################################################
+    #### Full cell path of the abstract path of the last query
+    ############################################################
+    def refine(self, abstract):
+        path = [abstract[0]]
+        for a, b in zip(abstract, abstract[1:]):
+            path.extend(self.refine_edge(a, b))
+        self.expanded += len(path) - 1
+        return path
+
+    ############################################################
+    #### Full cell path from start to goal, None if unreachable
+    ############################################################
+    def find_path(self, start_pos, goal_pos):
+        abstract = self.find_abstract_path(start_pos, goal_pos)
+        if abstract is None:
+            return None
+        return self.refine(abstract)
@@ -0,0 +1,248 @@
+########################################################
+#### Jump Point Search on a uniform cost grid.
+#### Plain A* pushes every one of the many equal cost
+#### paths through a hallway or an open ward. JPS only
+#### expands jump points: cells where an optimal path may
+#### have to turn. Everything in between is skipped over
+#### by scanning in a straight line.
+####
+#### 4 neighbours (AI_Final.py, HW4/Problem1/ASTAR.py):
+####   Optimal paths are made canonical by moving along a
+####   column before moving along a row. A row scan stops
+####   where a cell beside it opens up behind a wall, and
+####   a column scan stops where a row scan out of it
+####   finds something.
+#### 8 neighbours (HW4/Problem2/EASTAR.py moves):
+####   Standard JPS with octile costs (diagonal = sqrt 2).
+####   A diagonal move may not cut the corner of a wall.
+####   The pruning rules only hold for octile costs, so
+####   this mode does not charge 1 for a diagonal.
+####
+#### A search returns the jump points; expand() turns
+#### them into the full cell path only when needed.
+#### AI, Spring 2024
+########################################################
+import heapq
+import math
+
+from grid import WALL_CODES, wall_mask
+
+SQRT2 = math.sqrt(2)
+
+
+class JumpPointSearch:
+    def __init__(self, maze, diagonal=False, wall_codes=WALL_CODES):
+        self.rows = len(maze)
+        self.cols = len(maze[0])
+        self.walls = wall_mask(maze, wall_codes)
+        self.diagonal = diagonal
+        #### Jump points taken off the open list during the last search
+        self.expanded = 0
+        self.goal = None
+
+    #### The cell is inside the maze and not a wall
+    def walkable(self, x, y):
+        return 0 <= x < self.rows and 0 <= y < self.cols and not self.walls[x * self.cols + y]
+
+    ############################################################
+    #### Cost and heuristic between two cells: Manhattan for 4
+    #### neighbours and octile for 8 neighbours
+    ############################################################
+    def distance(self, a, b):
+        dx = abs(a[0] - b[0])
+        dy = abs(a[1] - b[1])
+        if self.diagonal:
+            return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+        return dx + dy
+
+    ############################################################
+    #### A* over jump points. Returns the list of jump points
+    #### from start to goal or None when it can not be reached.
+    ############################################################
+    def find_jump_points(self, start, goal):
+        self.expanded = 0
+        self.goal = goal
+        if not self.walkable(*start) or not self.walkable(*goal):
+            return None
+        g = {start: 0}
+        parent = {start: None}
+        closed = set()
+        open_set = [(self.distance(start, goal), start)]
+        while open_set:
+            current_cost, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.expanded += 1
+            if current == goal:
+                points = []
+                while current is not None:
+                    points.append(current)
+                    current = parent[current]
+                points.reverse()
+                return points
+
+            for point in self.successors(current, parent[current]):
+                if point in closed:
+                    continue
+                new_g = g[current] + self.distance(current, point)
+                if new_g < g.get(point, float("inf")):
+                    g[point] = new_g
+                    parent[point] = current
+                    heapq.heappush(open_set, (new_g + self.distance(point, goal), point))
+        return None
+
+    ############################################################
+    #### Full cell path from start to goal, None if unreachable
+    ############################################################
+    def find_path(self, start, goal):
+        points = self.find_jump_points(start, goal)
+        if points is None:
+            return None
+        return self.expand(points)
+
+    ############################################################
+    #### Fill in the cells between consecutive jump points.
+    #### Two jump points always lie on one row, column or
+    #### diagonal, so this just steps towards the next one.
+    ############################################################
+    def expand(self, points):
+        path = [points[0]]
+        for a, b in zip(points, points[1:]):
+            dx = (b[0] > a[0]) - (b[0] < a[0])
+            dy = (b[1] > a[1]) - (b[1] < a[1])
+            x, y = a
+            while (x, y) != b:
+                x += dx
+                y += dy
+                path.append((x, y))
+        return path
+
+    ############################################################
+    #### Jump points reached from node, given the jump point it
+    #### was reached from (None for the start)
+    ############################################################
+    def successors(self, node, parent):
+        points = []
+        for dx, dy in self.pruned_directions(node, parent):
+            if self.diagonal:
+                point = self.jump8(node[0], node[1], dx, dy)
+            elif dx == 0:
+                point = self.jump_row(node[0], node[1], dy)
+            else:
+                point = self.jump_column(node[0], node[1], dx)
+            if point is not None:
+                points.append(point)
+        return points
+
+    ############################################################
+    #### Directions that still need to be searched out of node
+    ############################################################
+    def pruned_directions(self, node, parent):
+        x, y = node
+        walkable = self.walkable
+        if parent is None:
+            if self.diagonal:
+                return [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+            return [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        dx = (x > parent[0]) - (x < parent[0])
+        dy = (y > parent[1]) - (y < parent[1])
+
+        if not self.diagonal:
+            #### Reached along a row: go on, and turn only where forced
+            if dx == 0:
+                directions = [(0, dy)]
+                for side in (1, -1):
+                    if walkable(x + side, y) and not walkable(x + side, y - dy):
+                        directions.append((side, 0))
+                return directions
+            #### Reached along a column: go on or turn onto the row
+            return [(dx, 0), (0, 1), (0, -1)]
+
+        directions = []
+        if dx and dy:
+            if walkable(x, y + dy):
+                directions.append((0, dy))
+            if walkable(x + dx, y):
+                directions.append((dx, 0))
+            if walkable(x, y + dy) and walkable(x + dx, y):
+                directions.append((dx, dy))
+        elif dx:
+            if walkable(x + dx, y):
+                directions.append((dx, 0))
+                for side in (1, -1):
+                    if walkable(x, y + side):
+                        directions.append((dx, side))
+            for side in (1, -1):
+                if walkable(x, y + side):
+                    directions.append((0, side))
+        else:
+            if walkable(x, y + dy):
+                directions.append((0, dy))
+                for side in (1, -1):
+                    if walkable(x + side, y):
+                        directions.append((side, dy))
+            for side in (1, -1):
+                if walkable(x + side, y):
+                    directions.append((side, 0))
+        return directions
+
+    ############################################################
+    #### 4 neighbours: scan along the row in direction dy
+    ############################################################
+    def jump_row(self, x, y, dy):
+        walkable = self.walkable
+        while True:
+            y += dy
+            if not walkable(x, y):
+                return None
+            if (x, y) == self.goal:
+                return (x, y)
+            #### A cell beside the row that could not be reached by
+            #### moving along the column first
+            for side in (1, -1):
+                if walkable(x + side, y) and not walkable(x + side, y - dy):
+                    return (x, y)
+
+    ############################################################
+    #### 4 neighbours: scan along the column in direction dx,
+    #### stopping where a row scan finds a jump point
+    ############################################################
+    def jump_column(self, x, y, dx):
+        walkable = self.walkable
+        while True:
+            x += dx
+            if not walkable(x, y):
+                return None
+            if (x, y) == self.goal:
+                return (x, y)
+            if self.jump_row(x, y, 1) is not None or self.jump_row(x, y, -1) is not None:
+                return (x, y)
+
+    ############################################################
+    #### 8 neighbours: scan in direction (dx, dy) without
+    #### cutting corners
+    ############################################################
+    def jump8(self, x, y, dx, dy):
+        walkable = self.walkable
+        while True:
+            if not walkable(x + dx, y + dy):
+                return None
+            if dx and dy and not (walkable(x + dx, y) and walkable(x, y + dy)):
+                return None
+            x += dx
+            y += dy
+            if (x, y) == self.goal:
+                return (x, y)
+            if dx and dy:
+                #### A diagonal stops where a straight scan finds something
+                if self.jump8(x, y, dx, 0) is not None or self.jump8(x, y, 0, dy) is not None:
+                    return (x, y)
+            elif dx:
+                for side in (1, -1):
+                    if walkable(x, y + side) and not walkable(x - dx, y + side):
+                        return (x, y)
+            else:
+                for side in (1, -1):
+                    if walkable(x + side, y) and not walkable(x + side, y - dy):
+                        return (x, y)
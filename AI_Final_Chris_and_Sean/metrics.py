@@ -0,0 +1,204 @@
+########################################################
+#### Opt-in search metrics for the Planner.
+#### Pass Planner(maze, metrics=PlannerMetrics()) and
+#### every leg is timed and its search counters are kept:
+#### cells expanded, pushes, stale pops and the peak open
+#### list size, along with the ward of the goal and what
+#### answered the leg (astar, an engine, the route cache,
+#### the distance tables, or the component check). Whole
+#### rounds from Planner.plan are timed too.
+####
+#### A counter the search did not keep (most engines only
+#### count expanded cells) is None, written as null, and is
+#### left out of the Prometheus totals, so a real 0 can be
+#### told apart from one that was never measured.
+####
+#### The metrics can be written as JSON lines, one leg or
+#### round per line, or as Prometheus text for scraping.
+#### Hooks are told when a leg starts and finishes, e.g.
+#### ProfileLeg runs a profiler over one slow leg only.
+#### AI, Spring 2024
+########################################################
+import cProfile
+import json
+from collections import deque
+
+
+######################################################
+#### Everything measured for one leg
+######################################################
+class LegRecord:
+    def __init__(self, start, goal, ward, source, path, seconds, stats, cost=None):
+        self.start = start
+        self.goal = goal
+        #### Hospital code of the goal cell
+        self.ward = ward
+        self.source = source
+        self.found = path is not None
+        #### Number of steps unless the planner has a cost map
+        self.cost = None if path is None else len(path) - 1 if cost is None else cost
+        self.seconds = seconds
+        #### None when the search did not count it
+        self.expanded = stats.get("expanded")
+        self.pushes = stats.get("pushes")
+        self.stale = stats.get("stale")
+        self.peak_open = stats.get("peak_open")
+
+    def to_dict(self):
+        return {
+            "type": "leg",
+            "start": self.start,
+            "goal": self.goal,
+            "ward": self.ward,
+            "source": self.source,
+            "found": self.found,
+            "cost": self.cost,
+            "seconds": self.seconds,
+            "expanded": self.expanded,
+            "pushes": self.pushes,
+            "stale": self.stale,
+            "peak_open": self.peak_open,
+        }
+
+
+######################################################
+#### Base class of the hooks, both calls do nothing
+######################################################
+class LegHook:
+    def leg_started(self, start, goal):
+        pass
+
+    def leg_finished(self, record):
+        pass
+
+
+############################################################
+#### Profile one leg. The first leg that matches start and
+#### goal (None matches any cell) is run under the profiler.
+#### Any profiler with start()/stop() works, e.g. a sampling
+#### profiler; cProfile's enable()/disable() is the default.
+############################################################
+class ProfileLeg(LegHook):
+    def __init__(self, start=None, goal=None, profiler=None):
+        self.start = start
+        self.goal = goal
+        self.profiler = profiler if profiler is not None else cProfile.Profile()
+        self.active = False
+        #### LegRecord of the profiled leg once it is done
+        self.record = None
+
+    def leg_started(self, start, goal):
+        if self.record is not None or self.active:
+            return
+        if (self.start is None or self.start == start) and (self.goal is None or self.goal == goal):
+            self.active = True
+            if hasattr(self.profiler, "start"):
+                self.profiler.start()
+            else:
+                self.profiler.enable()
+
+    def leg_finished(self, record):
+        if not self.active:
+            return
+        if hasattr(self.profiler, "stop"):
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+        self.active = False
+        self.record = record
+
+
+class PlannerMetrics:
+    def __init__(self, hooks=None, max_records=10000):
+        self.hooks = list(hooks or [])
+        #### The latest legs and rounds, oldest are dropped
+        self.records = deque(maxlen=max_records)
+        #### Running totals for Prometheus, never reset. A source
+        #### only gets a counter once one of its legs measured it.
+        self.legs = {}          # (source, result) -> count
+        self.expanded = {}      # source -> cells expanded
+        self.pushes = {}        # source -> pushes
+        self.stale = {}         # source -> stale pops
+        self.peak_open = {}     # source -> largest open list of a leg
+        self.leg_seconds = {}   # ward -> [sum, count]
+        self.route_seconds = [0.0, 0]
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def leg_started(self, start, goal):
+        for hook in self.hooks:
+            hook.leg_started(start, goal)
+
+    ############################################################
+    #### Record a leg the planner just finished
+    ############################################################
+    def leg_finished(self, planner, start, goal, path, seconds):
+        record = LegRecord(start, goal, int(planner.maze[goal[0]][goal[1]]), planner.last_source, path, seconds, planner.search_stats(),
+                           None if path is None else planner.path_cost(path))
+        self.records.append(record.to_dict())
+
+        source = record.source
+        key = (source, "found" if record.found else "failed")
+        self.legs[key] = self.legs.get(key, 0) + 1
+        for totals, count in ((self.expanded, record.expanded), (self.pushes, record.pushes), (self.stale, record.stale)):
+            if count is not None:
+                totals[source] = totals.get(source, 0) + count
+        if record.peak_open is not None and record.peak_open >= self.peak_open.get(source, 0):
+            self.peak_open[source] = record.peak_open
+        total = self.leg_seconds.setdefault(record.ward, [0.0, 0])
+        total[0] += seconds
+        total[1] += 1
+
+        for hook in self.hooks:
+            hook.leg_finished(record)
+        return record
+
+    def route_finished(self, plan, seconds):
+        self.records.append({
+            "type": "route",
+            "start": plan.start,
+            "stops": len(plan.legs) + len(plan.fails),
+            "fails": plan.fails,
+            "cost": plan.cost,
+            "seconds": seconds,
+        })
+        self.route_seconds[0] += seconds
+        self.route_seconds[1] += 1
+
+    #### The kept records, one JSON document per line
+    def json_lines(self):
+        return "".join(json.dumps(record) + "\n" for record in self.records)
+
+    def write_json_lines(self, path):
+        with open(path, "a") as f:
+            f.write(self.json_lines())
+
+    ############################################################
+    #### Totals in the Prometheus text exposition format
+    ############################################################
+    def prometheus(self, prefix="planner"):
+        lines = []
+
+        def metric(name, kind, text, samples):
+            lines.append("# HELP %s_%s %s" % (prefix, name, text))
+            lines.append("# TYPE %s_%s %s" % (prefix, name, kind))
+            for labels, value in samples:
+                label_text = ",".join('%s="%s"' % pair for pair in labels)
+                lines.append("%s_%s%s %s" % (prefix, name, "{" + label_text + "}" if label_text else "", value))
+
+        metric("legs_total", "counter", "Legs planned.", [((("source", source), ("result", result)), count) for (source, result), count in sorted(self.legs.items())])
+        metric("expanded_total", "counter", "Cells expanded.", [((("source", source),), count) for source, count in sorted(self.expanded.items())])
+        metric("pushes_total", "counter", "Open list pushes.", [((("source", source),), count) for source, count in sorted(self.pushes.items())])
+        metric("stale_pops_total", "counter", "Outdated open list entries skipped.", [((("source", source),), count) for source, count in sorted(self.stale.items())])
+        metric("open_peak", "gauge", "Largest open list of any leg.", [((("source", source),), peak) for source, peak in sorted(self.peak_open.items())])
+        lines.append("# HELP %s_leg_seconds Time to plan one leg, by ward of the goal." % prefix)
+        lines.append("# TYPE %s_leg_seconds summary" % prefix)
+        for ward, (total, count) in sorted(self.leg_seconds.items()):
+            lines.append('%s_leg_seconds_sum{ward="%d"} %r' % (prefix, ward, total))
+            lines.append('%s_leg_seconds_count{ward="%d"} %d' % (prefix, ward, count))
+        lines.append("# HELP %s_route_seconds Time to plan a delivery round." % prefix)
+        lines.append("# TYPE %s_route_seconds summary" % prefix)
+        lines.append("%s_route_seconds_sum %r" % (prefix, self.route_seconds[0]))
+        lines.append("%s_route_seconds_count %d" % (prefix, self.route_seconds[1]))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,522 @@
+########################################################
+#### Delivery rounds for a fleet of robots on one floor.
+#### Planned one by one the robots run into each other in
+#### one cell wide hallways. Here every robot is planned
+#### in space and time: a state is (cell, time, stops
+#### reached) and a robot may move or wait one step. The
+#### cells and moves other robots use are kept in a
+#### reservation table, so no two robots are ever on the
+#### same cell at the same time or swap cells in one step.
+#### Once done, a robot parks on the first cell it can
+#### keep for good, usually its last stop.
+####
+#### Modes:
+####   "cooperative" every robot is planned in priority
+####                 order around the robots before it;
+####                 a robot that can not even park goes
+####                 first and the order is planned again;
+####                 one still stuck then stays on its start
+####   "windowed"    the same, but only window steps
+####                 ahead; the robots move half a window,
+####                 then all are planned again with the
+####                 priorities rotated
+####   "cbs"         conflict-based search: robots are
+####                 planned alone and split on their first
+####                 conflict, optimal for small groups.
+####                 Falls back to "cooperative" when the
+####                 group or the search gets too big.
+#### When the other two modes leave a robot stuck, e.g.
+#### two robots meeting head on in a hallway, a small
+#### group is planned again with "cbs".
+#### The heuristic is the true distance to the next stop
+#### plus the legs after it, read from the planner's flow
+#### fields (see flowfield.py). After the last reserved
+#### time step the table no longer changes, so later time
+#### steps are folded into one and a search that can not
+#### succeed ends instead of running to the horizon.
+#### AI, Spring 2024
+########################################################
+import heapq
+import time
+
+#### E, W, S and N, same order as find_path, then wait
+MOVES = [(0, 1), (0, -1), (1, 0), (-1, 0), (0, 0)]
+
+#### Time steps a robot may take for its whole round
+HORIZON = 1000
+
+#### States one space-time search may expand before it gives up
+EXPANSIONS = 20000
+
+#### Steps the windowed mode looks ahead
+WINDOW = 16
+
+#### Times the cooperative mode plans again with a stuck robot first
+RETRIES = 3
+
+#### Robots and constraint tree nodes conflict-based search may use
+CBS_ROBOTS = 6
+CBS_NODES = 2000
+
+#### Owner of a CBS constraint, never a robot number
+CONSTRAINT = -1
+
+
+######################################################
+#### Cells and moves taken by robots over time
+######################################################
+class Reservations:
+    def __init__(self):
+        self.cells = {}      # (cell, t) -> robot on the cell at time t
+        self.moves = {}      # (a, b, t) -> robot that forbids the move a -> b from t to t + 1
+        self.latest = {}     # cell -> {robot: last time it is on the cell}
+        self.parked = {}     # cell -> (t, robot) that stays on the cell from t on
+        #### Last time any cell is reserved, after it nothing changes any more
+        self.end = 0
+
+    def copy(self):
+        other = Reservations()
+        other.cells = dict(self.cells)
+        other.moves = dict(self.moves)
+        other.latest = {cell: dict(robots) for cell, robots in self.latest.items()}
+        other.parked = dict(self.parked)
+        other.end = self.end
+        return other
+
+    def reserve_cell(self, robot, cell, t):
+        self.cells[(cell, t)] = robot
+        robots = self.latest.setdefault(cell, {})
+        if robots.get(robot, -1) < t:
+            robots[robot] = t
+        if t > self.end:
+            self.end = t
+
+    def forbid_move(self, robot, a, b, t):
+        self.moves[(a, b, t)] = robot
+        #### The move ends at t + 1, the table changes until then
+        if t + 1 > self.end:
+            self.end = t + 1
+
+    ############################################################
+    #### Reserve a path that starts at time t0. Every step also
+    #### forbids the swap back. The robot then parks on its
+    #### last cell, or stays there until time until.
+    ############################################################
+    def reserve(self, robot, path, t0=0, park=True, until=None):
+        for i, cell in enumerate(path):
+            self.reserve_cell(robot, cell, t0 + i)
+        for i, (a, b) in enumerate(zip(path, path[1:])):
+            if a != b:
+                self.forbid_move(robot, b, a, t0 + i)
+        end = t0 + len(path) - 1
+        if park:
+            self.parked[path[-1]] = (end, robot)
+        elif until is not None:
+            for t in range(end + 1, until + 1):
+                self.reserve_cell(robot, path[-1], t)
+
+    #### The robot may go from a at time t to b at t + 1 (a == b waits)
+    def free(self, robot, a, b, t):
+        other = self.cells.get((b, t + 1))
+        if other is not None and other != robot:
+            return False
+        other = self.moves.get((a, b, t))
+        if other is not None and other != robot:
+            return False
+        parked = self.parked.get(b)
+        return parked is None or parked[1] == robot or parked[0] > t + 1
+
+    ############################################################
+    #### No other robot needs the cell from time t on (up to
+    #### until, or forever when until is None)
+    ############################################################
+    def can_park(self, robot, cell, t, until=None):
+        parked = self.parked.get(cell)
+        if parked is not None and parked[1] != robot:
+            return False
+        robots = self.latest.get(cell, {})
+        if all(last < t for other, last in robots.items() if other != robot):
+            return True
+        if until is None:
+            return False
+        for step in range(t, until + 1):
+            other = self.cells.get((cell, step))
+            if other is not None and other != robot:
+                return False
+        return True
+
+
+############################################################
+#### First pair of robots that collide, None if there is
+#### none. A robot stays on its last cell after its path.
+#### Returns (t, i, j, kind, a, b): kind "cell" means both
+#### are on a at time t, "swap" means i moves a -> b while
+#### j moves b -> a between t and t + 1.
+############################################################
+def first_conflict(paths):
+    end = max(len(path) for path in paths)
+
+    def at(path, t):
+        return path[t] if t < len(path) else path[-1]
+
+    for t in range(end):
+        seen = {}
+        for i, path in enumerate(paths):
+            cell = at(path, t)
+            if cell in seen:
+                return (t, seen[cell], i, "cell", cell, cell)
+            seen[cell] = i
+        if t + 1 < end:
+            moving = {}
+            for i, path in enumerate(paths):
+                a = at(path, t)
+                b = at(path, t + 1)
+                if a != b:
+                    if (b, a) in moving:
+                        return (t, moving[(b, a)], i, "swap", b, a)
+                    moving[(a, b)] = i
+    return None
+
+
+######################################################
+#### Round of one robot: its cell at every time step
+#### and when each stop was reached
+######################################################
+class RobotPlan:
+    def __init__(self, robot, start, stops, path, fails):
+        self.robot = robot
+        self.start = start
+        self.stops = stops
+        self.path = path
+        self.fails = fails
+        #### (stop, time) of every stop that was reached
+        self.arrivals = []
+        done = set(fails)
+        todo = [stop for stop in stops if stop not in done]
+        k = 0
+        for t, cell in enumerate(path):
+            while k < len(todo) and cell == todo[k]:
+                self.arrivals.append((todo[k], t))
+                k += 1
+
+    @property
+    def delivered(self):
+        return len(self.arrivals)
+
+    #### Time the last stop was reached
+    @property
+    def finish(self):
+        return self.arrivals[-1][1] if self.arrivals else 0
+
+
+class FleetPlan:
+    def __init__(self, mode, robots, seconds):
+        self.mode = mode
+        self.robots = robots
+        #### Time it took to plan, in seconds
+        self.seconds = seconds
+        #### Should always be None, kept as a check on the plan
+        self.conflict = first_conflict([robot.path for robot in robots]) if robots else None
+
+    #### Time steps until every robot has made its last delivery
+    @property
+    def makespan(self):
+        return max([robot.finish for robot in self.robots] + [0])
+
+    @property
+    def delivered(self):
+        return sum(robot.delivered for robot in self.robots)
+
+    #### Deliveries per time step
+    @property
+    def throughput(self):
+        if self.makespan == 0:
+            return 0.0
+        return self.delivered / self.makespan
+
+    def __str__(self):
+        stops = sum(len(robot.stops) for robot in self.robots)
+        return "%s: %d robots, %d/%d stops delivered, makespan %d steps, throughput %.3f deliveries/step, planned in %.3f s" % (
+            self.mode, len(self.robots), self.delivered, stops, self.makespan, self.throughput, self.seconds)
+
+
+class FleetPlanner:
+    def __init__(self, planner, mode="cooperative", window=WINDOW, horizon=HORIZON, expansions=EXPANSIONS, cbs_robots=CBS_ROBOTS, cbs_nodes=CBS_NODES):
+        if mode not in ("cooperative", "windowed", "cbs"):
+            raise ValueError("Unknown mode: " + str(mode))
+        self.planner = planner
+        self.mode = mode
+        self.window = window
+        self.horizon = horizon
+        self.expansions = expansions
+        self.cbs_robots = cbs_robots
+        self.cbs_nodes = cbs_nodes
+        #### States expanded by the space-time searches of the last plan
+        self.expanded = 0
+        #### A robot of the last plan could not get out of the way
+        self.stuck = False
+
+    ############################################################
+    #### Plan every robot's round. robots is a list of (start,
+    #### stops) with the stops in delivery order. Stops a robot
+    #### can not reach fail at once, like in Planner.plan.
+    ############################################################
+    def plan(self, robots):
+        began = time.perf_counter()
+        self.expanded = 0
+        self.stuck = False
+        starts = [start for start, stops in robots]
+        if len(set(starts)) != len(starts):
+            raise ValueError("Two robots can not start on the same cell")
+        components = self.planner.components
+        stops = [[stop for stop in stop_list if components.connected(start, stop)] for start, stop_list in robots]
+        unreachable = [[stop for stop in stop_list if not components.connected(start, stop)] for start, stop_list in robots]
+        fails = [list(stop_list) for stop_list in unreachable]
+
+        mode = self.mode
+        paths = None
+        if mode == "cbs":
+            if len(robots) <= self.cbs_robots:
+                paths = self.plan_cbs(starts, stops)
+            if paths is None:
+                mode = "cooperative"
+        if mode == "cooperative":
+            paths = self.plan_cooperative(starts, stops, fails)
+        elif mode == "windowed":
+            paths = self.plan_windowed(starts, stops, fails)
+        if self.stuck and mode != "cbs" and len(robots) <= self.cbs_robots:
+            cbs_paths = self.plan_cbs(starts, stops)
+            if cbs_paths is not None:
+                mode, paths, fails = "cbs", cbs_paths, unreachable
+                self.stuck = False
+
+        plans = [RobotPlan(r, start, stop_list, paths[r], fails[r]) for r, (start, stop_list) in enumerate(robots)]
+        return FleetPlan(mode, plans, time.perf_counter() - began)
+
+    ############################################################
+    #### Space-time A* for one robot from start at time t0 over
+    #### its stops, around the reservations. The robot must be
+    #### able to park where it ends. With window_end set, a
+    #### state at that time ends the search as well and the
+    #### robot only has to stay free until then.
+    #### Returns the cells from t0 on, None if there is no way.
+    ############################################################
+    def search(self, robot, start, stops, t0, table, window_end=None):
+        planner = self.planner
+        rows, cols, walls = planner.rows, planner.cols, planner.walls
+        n = len(stops)
+        fields = [planner.flows.field(stop).dist for stop in stops]
+        #### Steps of the legs after stop k
+        tail = [0] * (n + 1)
+        for k in range(n - 2, -1, -1):
+            tail[k] = tail[k + 1] + int(fields[k + 1][stops[k]])
+
+        def h(cell, k):
+            if k == n:
+                return 0
+            return int(fields[k][cell]) + tail[k]
+
+        k = 0
+        while k < n and start == stops[k]:
+            k += 1
+        #### States after this time are stored at this time
+        still = max(table.end + 1, window_end or 0)
+        first = (start, min(t0, still), k)
+        g = {first: 0}
+        parent = {first: None}
+        closed = set()
+        count = 0
+        open_set = [(h(start, k), -k, 0, count, first)]
+        limit = t0 + self.horizon
+        expanded = 0
+        while open_set and expanded < self.expansions:
+            state = heapq.heappop(open_set)[-1]
+            if state in closed:
+                continue
+            closed.add(state)
+            expanded += 1
+            cell, stored, k = state
+            t = t0 + g[state]
+            if (k == n and table.can_park(robot, cell, t, window_end)) or t == window_end:
+                path = []
+                while state is not None:
+                    path.append(state[0])
+                    state = parent[state]
+                path.reverse()
+                self.expanded += expanded
+                return path
+            if t >= limit:
+                continue
+            new_g = g[state] + 1
+            for dx, dy in MOVES:
+                new = (cell[0] + dx, cell[1] + dy)
+                if not (0 <= new[0] < rows and 0 <= new[1] < cols) or walls[new[0] * cols + new[1]]:
+                    continue
+                if not table.free(robot, cell, new, t):
+                    continue
+                new_k = k
+                while new_k < n and new == stops[new_k]:
+                    new_k += 1
+                new_state = (new, min(t + 1, still), new_k)
+                if new_state in closed or (new_state in g and new_g >= g[new_state]):
+                    continue
+                g[new_state] = new_g
+                parent[new_state] = state
+                count += 1
+                heapq.heappush(open_set, (new_g + h(new, new_k), -new_k, -new_g, count, new_state))
+        self.expanded += expanded
+        return None
+
+    ############################################################
+    #### Prioritised planning, see prioritised(). A robot that
+    #### can not even park is moved to the front and all are
+    #### planned again, up to RETRIES times. A robot still stuck
+    #### after that is held on its start from time 0 on and the
+    #### others are planned around it, so the plan never
+    #### collides.
+    ############################################################
+    def plan_cooperative(self, starts, stops, fails):
+        order = list(range(len(starts)))
+        for attempt in range(RETRIES + 1):
+            paths, dropped, stuck = self.prioritised(order, starts, stops)
+            if stuck is None:
+                break
+            order.remove(stuck)
+            order.insert(0, stuck)
+        held = set()
+        while stuck is not None:
+            held.add(stuck)
+            paths, dropped, stuck = self.prioritised(order, starts, stops, held)
+        self.stuck = len(held) > 0
+        for r in range(len(starts)):
+            fails[r][:0] = dropped[r]
+        return paths
+
+    ############################################################
+    #### Robots in order, each around the paths of the ones
+    #### before. A robot that finds no way drops its last stop
+    #### until it does. One that finds none at all stays on
+    #### its start, where a robot before it may pass, so the
+    #### round has to be planned again. Robots in held stay on
+    #### their start and every other robot goes around them.
+    #### Returns the paths, the dropped stops of every robot
+    #### and the first robot that stayed, or None.
+    ############################################################
+    def prioritised(self, order, starts, stops, held=()):
+        table = Reservations()
+        for r, start in enumerate(starts):
+            if r in held:
+                table.reserve(r, [start])
+            else:
+                table.reserve_cell(r, start, 0)
+        paths = [None] * len(starts)
+        dropped = [[] for start in starts]
+        stuck = None
+        for r in order:
+            if r in held:
+                paths[r] = [starts[r]]
+                dropped[r] = list(stops[r])
+                continue
+            todo = list(stops[r])
+            path = self.search(r, starts[r], todo, 0, table)
+            while path is None and todo:
+                dropped[r].insert(0, todo.pop())
+                path = self.search(r, starts[r], todo, 0, table)
+            if path is None:
+                path = [starts[r]]
+                if stuck is None:
+                    stuck = r
+            table.reserve(r, path)
+            paths[r] = path
+        return paths, dropped, stuck
+
+    ############################################################
+    #### Windowed cooperative A*: plan window steps ahead, move
+    #### half a window, plan again. A robot that can not be
+    #### planned goes first and the window is planned again.
+    ############################################################
+    def plan_windowed(self, starts, stops, fails):
+        n = len(starts)
+        paths = [[start] for start in starts]
+        done = [0] * n
+        for r, start in enumerate(starts):
+            while done[r] < len(stops[r]) and stops[r][done[r]] == start:
+                done[r] += 1
+        order = list(range(n))
+        step = max(1, self.window // 2)
+        t = 0
+        retries = 0
+        while any(done[r] < len(stops[r]) for r in range(n)) and t < self.horizon:
+            end = t + self.window
+            table = Reservations()
+            for r in range(n):
+                table.reserve_cell(r, paths[r][-1], t)
+            planned = {}
+            stuck = None
+            for r in order:
+                path = self.search(r, paths[r][-1], stops[r][done[r]:], t, table, end)
+                if path is None:
+                    stuck = r
+                    break
+                path = path + [path[-1]] * (self.window + 1 - len(path))
+                table.reserve(r, path, t, park=False)
+                planned[r] = path
+            if stuck is not None:
+                retries += 1
+                if retries > n:
+                    self.stuck = True
+                    break
+                order.remove(stuck)
+                order.insert(0, stuck)
+                continue
+            retries = 0
+            for r in range(n):
+                for cell in planned[r][1:step + 1]:
+                    paths[r].append(cell)
+                    while done[r] < len(stops[r]) and cell == stops[r][done[r]]:
+                        done[r] += 1
+            t += step
+            order = order[1:] + order[:1]
+        for r in range(n):
+            fails[r].extend(stops[r][done[r]:])
+        return paths
+
+    ############################################################
+    #### Conflict-based search. None when a robot can not be
+    #### planned or the node limit is reached.
+    ############################################################
+    def plan_cbs(self, starts, stops):
+        constraints = [Reservations() for start in starts]
+        paths = []
+        for r, start in enumerate(starts):
+            path = self.search(r, start, stops[r], 0, constraints[r])
+            if path is None:
+                return None
+            paths.append(path)
+        count = 0
+        open_set = [(sum(len(path) for path in paths), count, constraints, paths)]
+        nodes = 0
+        while open_set and nodes < self.cbs_nodes:
+            cost, _, constraints, paths = heapq.heappop(open_set)
+            nodes += 1
+            conflict = first_conflict(paths)
+            if conflict is None:
+                return paths
+            t, i, j, kind, a, b = conflict
+            #### One child forbids the conflict to each of the two robots
+            for robot, move in ((i, (a, b)), (j, (b, a))):
+                table = constraints[robot].copy()
+                if kind == "cell":
+                    table.reserve_cell(CONSTRAINT, a, t)
+                else:
+                    table.forbid_move(CONSTRAINT, move[0], move[1], t)
+                path = self.search(robot, starts[robot], stops[robot], 0, table)
+                if path is None:
+                    continue
+                new_constraints = list(constraints)
+                new_constraints[robot] = table
+                new_paths = list(paths)
+                new_paths[robot] = path
+                count += 1
+                heapq.heappush(open_set, (sum(len(p) for p in new_paths), count, new_constraints, new_paths))
+        return None
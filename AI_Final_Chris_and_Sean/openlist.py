@@ -0,0 +1,249 @@
+########################################################
+#### Open lists for the grid searches.
+#### queue.PriorityQueue takes a lock on every put/get.
+#### The searches are single threaded so a plain heapq
+#### list does the same work without the locking. Every
+#### open list counts its pushes and pops as well as the
+#### work the search avoided: stale entries that were
+#### popped but not expanded again, and pushes that were
+#### skipped because the cell was already closed.
+#### When every move costs 1 and h() is an integer the
+#### f() values are small integers, so a bucket queue
+#### (Dial's algorithm) pushes and pops in O(1). With
+#### larger whole costs per step a radix heap keeps
+#### only one bucket per bit of the priority.
+#### AI, Spring 2024
+########################################################
+import heapq
+from queue import PriorityQueue
+
+
+######################################################
+#### Binary heap open list without locking
+######################################################
+class HeapOpenList:
+    def __init__(self):
+        self.heap = []
+        self.pushes = 0
+        self.pops = 0
+        self.peak = 0
+        self.stale = 0           # pops that were skipped instead of expanded
+        self.closed_skips = 0    # pushes that were skipped for closed cells
+
+    def push(self, priority, item):
+        heapq.heappush(self.heap, (priority, item))
+        self.pushes += 1
+        if len(self.heap) > self.peak:
+            self.peak = len(self.heap)
+
+    def pop(self):
+        self.pops += 1
+        return heapq.heappop(self.heap)
+
+    def __len__(self):
+        return len(self.heap)
+
+    #### Counters of the last search as a dict
+    def stats(self):
+        return {
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "expanded": self.pops - self.stale,
+            "stale": self.stale,
+            "closed_skips": self.closed_skips,
+            "peak": self.peak,
+        }
+
+
+######################################################
+#### The original queue.PriorityQueue behind the same
+#### interface. Kept so the two can be compared.
+######################################################
+class QueueOpenList(HeapOpenList):
+    def __init__(self):
+        super().__init__()
+        self.queue = PriorityQueue()
+
+    def push(self, priority, item):
+        self.queue.put((priority, item))
+        self.pushes += 1
+        if self.queue.qsize() > self.peak:
+            self.peak = self.queue.qsize()
+
+    def pop(self):
+        self.pops += 1
+        return self.queue.get()
+
+    def __len__(self):
+        return self.queue.qsize()
+
+
+######################################################
+#### Bucket queue (Dial's algorithm) for integer f().
+#### buckets[f] holds every item pushed with priority f
+#### and low is the lowest bucket that may hold items.
+#### Items of one bucket are popped last in first out,
+#### which prefers the deeper of two cells with equal f().
+#### A priority that is not a non-negative integer moves
+#### every item into a binary heap for the rest of the
+#### search, e.g. for a Euclidean heuristic.
+######################################################
+class BucketOpenList(HeapOpenList):
+    def __init__(self):
+        super().__init__()
+        self.buckets = []
+        self.low = 0
+        self.size = 0
+        self.fallback = False
+
+    def push(self, priority, item):
+        if self.fallback:
+            return super().push(priority, item)
+        f = int(priority)
+        if f != priority or f < 0:
+            self.to_heap()
+            return super().push(priority, item)
+        buckets = self.buckets
+        if f >= len(buckets):
+            buckets.extend([] for _ in range(f + 1 - len(buckets)))
+        buckets[f].append(item)
+        if f < self.low:
+            self.low = f
+        self.size += 1
+        self.pushes += 1
+        if self.size > self.peak:
+            self.peak = self.size
+
+    def pop(self):
+        if self.fallback:
+            return super().pop()
+        buckets = self.buckets
+        low = self.low
+        while not buckets[low]:
+            low += 1
+        self.low = low
+        self.size -= 1
+        self.pops += 1
+        return (low, buckets[low].pop())
+
+    def __len__(self):
+        if self.fallback:
+            return len(self.heap)
+        return self.size
+
+    ############################################################
+    #### Move every bucket into the binary heap
+    ############################################################
+    def to_heap(self):
+        self.heap = [(f, item) for f in range(self.low, len(self.buckets)) for item in self.buckets[f]]
+        heapq.heapify(self.heap)
+        self.buckets = []
+        self.size = 0
+        self.fallback = True
+
+
+
+######################################################
+#### Radix heap for whole, non-negative priorities that
+#### never drop below the last one popped, e.g. f() of
+#### A* with a consistent heuristic or Dijkstra on
+#### integer cell costs. buckets[i] holds the items
+#### whose priority first differs from last in bit i - 1
+#### (bucket 0: equal to last). A pop from an empty
+#### bucket 0 takes the lowest non-empty bucket, makes its
+#### smallest priority the new last and spreads its
+#### items over the lower buckets. Every item moves down
+#### at most once per bit, unlike the bucket queue the
+#### size does not grow with the largest priority.
+######################################################
+class RadixOpenList(HeapOpenList):
+    def __init__(self):
+        super().__init__()
+        self.buckets = [[] for _ in range(65)]
+        self.last = 0
+        self.size = 0
+
+    def push(self, priority, item):
+        key = int(priority)
+        if key != priority or key < self.last:
+            raise ValueError("Radix heap priorities must be whole numbers no smaller than " + str(self.last) + ", got " + str(priority))
+        self.buckets[(key ^ self.last).bit_length()].append((key, item))
+        self.size += 1
+        self.pushes += 1
+        if self.size > self.peak:
+            self.peak = self.size
+
+    def pop(self):
+        buckets = self.buckets
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            bucket = buckets[i]
+            buckets[i] = []
+            last = min(bucket)[0]
+            self.last = last
+            for entry in bucket:
+                buckets[(entry[0] ^ last).bit_length()].append(entry)
+        self.size -= 1
+        self.pops += 1
+        return buckets[0].pop()
+
+    def __len__(self):
+        return self.size
+
+
+######################################################
+#### Heap open list that keeps the closed set of its
+#### search, for the HW4 scripts. Their heuristics are
+#### not always consistent, so a cheaper path to a
+#### closed cell opens it again (reopen). next() skips
+#### and counts stale entries, skip() counts a push that
+#### was left out because the cell is closed.
+######################################################
+class ClosedHeapOpenList(HeapOpenList):
+    def __init__(self):
+        super().__init__()
+        self.closed = set()
+
+    #### Next cell that is not closed yet, now closed, None when empty
+    def next(self):
+        while self.heap:
+            priority, item = self.pop()
+            if item in self.closed:
+                self.stale += 1
+                continue
+            self.closed.add(item)
+            return priority, item
+        return None
+
+    #### A cheaper path was found, the cell may be expanded again
+    def reopen(self, item):
+        self.closed.discard(item)
+
+    #### No cheaper path: a push skipped for a closed cell is counted
+    def skip(self, item):
+        if item in self.closed:
+            self.closed_skips += 1
+
+
+#### Open lists that can be picked by name for a search
+OPEN_LISTS = {
+    "heap": HeapOpenList,
+    "queue": QueueOpenList,
+    "bucket": BucketOpenList,
+    "radix": RadixOpenList,
+}
+
+
+############################################################
+#### Build a new open list from a name in OPEN_LISTS.
+#### "auto" picks the bucket queue when the search only
+#### produces integer priorities and the heap otherwise.
+############################################################
+def make_open_list(kind, integral=False):
+    if kind == "auto":
+        kind = "bucket" if integral else "heap"
+    if kind not in OPEN_LISTS:
+        raise ValueError("Unknown open list: " + str(kind))
+    return OPEN_LISTS[kind]()
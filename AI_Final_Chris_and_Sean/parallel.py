@@ -0,0 +1,134 @@
+########################################################
+#### Plan the legs of a delivery round in parallel.
+#### Once the order of the stops is fixed, every leg
+#### starts at the previous goal, or where the robot
+#### stayed when the previous goal could not be reached.
+#### The endpoints are worked out up front assuming every
+#### stop is reached, all legs are planned at once in a
+#### process pool, and only the legs after a failed stop
+#### are planned again from the right start. The result
+#### is the same Plan that Planner.plan returns, so
+#### MazeGame draws it the same way.
+####
+#### The workers get the planner's current walls, so cells
+#### closed with Planner.set_blocked stay closed, and its
+#### cost map when it has one. The pool starts new workers
+#### once the walls or the costs changed.
+#### AI, Spring 2024
+########################################################
+from concurrent.futures import ProcessPoolExecutor
+
+from planner import Leg, Plan, Planner
+
+#### Planner of this worker process, built once by init_worker
+workerPlanner = None
+
+
+############################################################
+#### Build the worker's planner with the given cost map (or
+#### None), then close and open the cells whose walls differ
+#### from the maze
+############################################################
+def init_worker(maze, open_list, search, wall_codes, walls, costs):
+    global workerPlanner
+    workerPlanner = Planner(maze, open_list=open_list, search=search, wall_codes=wall_codes)
+    if costs is not None:
+        costs.walls = workerPlanner.walls
+        workerPlanner.engine.costs = workerPlanner.costs = costs
+    for i, wall in enumerate(walls):
+        if wall != workerPlanner.walls[i]:
+            workerPlanner.set_blocked(divmod(i, workerPlanner.cols), wall == 1)
+
+
+#### Plan one (start, goal) leg in a worker process
+def find_leg(leg):
+    return workerPlanner.find_path(leg[0], leg[1])
+
+
+######################################################
+#### Process pool whose workers plan like the given
+#### planner. Reuse it for many rounds, starting workers
+#### is slow.
+######################################################
+class LegPool:
+    def __init__(self, planner, workers=None):
+        self.planner = planner
+        self.workers = workers
+        self.executor = None
+        #### Map and cost version the workers were started with
+        self.version = None
+        self.start()
+
+    #### Start the workers on the planner's current walls
+    def start(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+        planner = self.planner
+        self.version = planner.route_version()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                            initargs=(planner.maze, planner.open_list, planner.search, planner.wall_codes, bytes(planner.walls), planner.costs))
+
+    #### Plan the legs, with new workers if the map or the costs changed
+    def map(self, fn, legs):
+        if self.planner.route_version() != self.version:
+            self.start()
+        return self.executor.map(fn, legs)
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+def leg_pool(planner, workers=None):
+    return LegPool(planner, workers)
+
+
+############################################################
+#### Start of every leg, given the outcome of the legs that
+#### were already planned. A leg that was not planned yet
+#### is assumed to reach its goal.
+############################################################
+def leg_starts(startingPos, destList, known):
+    starts = []
+    pos = startingPos
+    for goal in destList:
+        starts.append(pos)
+        if known.get((pos, goal), True) is not None:
+            pos = goal
+    return starts
+
+
+############################################################
+#### Plan a round with the legs spread over a process pool.
+#### Each pass plans every leg whose start is not known to
+#### be planned yet, so the first wrong guess is fixed in
+#### every pass and the loop always ends.
+############################################################
+def plan_parallel(planner, startingPos, destList, pool=None, workers=None):
+    if pool is None:
+        with leg_pool(planner, workers) as pool:
+            return plan_parallel(planner, startingPos, destList, pool)
+
+    known = {}
+    while True:
+        starts = leg_starts(startingPos, destList, known)
+        pending = list(dict.fromkeys((start, goal) for start, goal in zip(starts, destList) if (start, goal) not in known))
+        if not pending:
+            break
+        for leg, path in zip(pending, pool.map(find_leg, pending)):
+            known[leg] = path
+
+    #### Stitch the legs back together in order
+    plan = Plan(startingPos)
+    for start, goal in zip(starts, destList):
+        path = known[(start, goal)]
+        if path is None:
+            plan.fails.append(goal)
+        else:
+            plan.legs.append(Leg(start, goal, path, planner.path_cost(path)))
+    return plan
@@ -0,0 +1,353 @@
+########################################################
+#### Headless A* planner for the hospital robot nurse.
+#### Plans every delivery leg without Tk so plans can be
+#### made on machines with no display. MazeGame in
+#### AI_Final.py is only a consumer that draws a Plan.
+#### AI, Spring 2024
+########################################################
+import time
+
+from ara import AnytimeAStar
+from bidirectional import BidirectionalAStar
+from components import ComponentIndex
+from costmap import CostMapSearch
+from dstarlite import DStarLite
+from eightway import EightWayAStar
+from flowfield import FlowFields
+from grid import WALL_CODES, wall_mask, walls_hash
+from heuristics import HeuristicFields
+from hpa import HierarchicalPlanner
+from jps import JumpPointSearch
+from openlist import make_open_list
+from searchstate import SearchState
+
+#### Search engines a Planner can hand its legs to instead of A*
+ENGINES = {
+    "jps": JumpPointSearch,
+    "hpa": HierarchicalPlanner,
+    "bidirectional": BidirectionalAStar,
+    "ara": AnytimeAStar,
+    "costmap": CostMapSearch,
+    "eightway": EightWayAStar,
+}
+
+
+######################################################
+#### A leg is one trip from start to goal. The path
+#### holds every cell from start to goal (inclusive).
+######################################################
+class Leg:
+    def __init__(self, start, goal, path, cost=None):
+        self.start = start
+        self.goal = goal
+        self.path = path
+        #### Number of steps when every move costs 1, else the
+        #### cost from the planner's cost map (see costmap.py)
+        self.cost = len(path) - 1 if cost is None else cost
+
+
+######################################################
+#### A plan is the result of a whole delivery round:
+#### the legs that were reached in order and the
+#### destinations that could not be reached.
+######################################################
+class Plan:
+    def __init__(self, start):
+        self.start = start
+        self.legs = []
+        self.fails = []
+
+    #### At least one destination was reached by the robot
+    @property
+    def success(self):
+        return len(self.legs) > 0
+
+    #### Total cost over every leg, the number of steps at unit cost
+    @property
+    def cost(self):
+        return sum(leg.cost for leg in self.legs)
+
+
+######################################################
+#### The planner only needs the hospital matrix.
+#### Walls (13) and cells out of the hospital (-1)
+#### can not be crossed. Cells are numbered
+#### x * cols + y so the search state can live in flat
+#### arrays that are reused by every leg.
+######################################################
+class Planner:
+    def __init__(self, maze, open_list="auto", tables=None, search="astar", cache=None, metrics=None, wall_codes=WALL_CODES, heuristic_fields="auto"):
+        self.maze = maze
+        #### Codes the robot can not cross, a floor file may set its own
+        self.wall_codes = wall_codes
+        #### "astar", "jps" (Jump Point Search, see jps.py),
+        #### "hpa" (hierarchical search on the wards, see hpa.py),
+        #### "bidirectional" (bidirectional A*, see bidirectional.py) or
+        #### "ara" (anytime weighted A*, see ara.py),
+        #### "costmap" (A* on ward costs, see costmap.py) or
+        #### "eightway" (8-neighbour A* with diagonals, see eightway.py)
+        self.search = search
+        self.engine = ENGINES[search](maze, wall_codes=wall_codes) if search in ENGINES else None
+        #### Optional DistanceTable (see distancetable.py) that answers
+        #### a leg with a lookup instead of a search
+        self.tables = tables
+        #### Optional RouteCache (see routecache.py) of finished legs
+        self.cache = cache
+        #### Optional PlannerMetrics (see metrics.py), off by default
+        self.metrics = metrics
+        #### Name of the open list used by default, see openlist.py
+        self.open_list = open_list
+        #### Open list of the last search, it holds the counters
+        self.last_search = None
+        #### What answered the last leg: "components", "cache",
+        #### "tables", the engine's name or "astar"
+        self.last_source = None
+        self.rows = len(maze)
+        self.cols = len(maze[0])
+        self.walls = wall_mask(maze, wall_codes)
+        self.state = SearchState(self.rows * self.cols)
+        #### Manhattan distance of every cell to recent goals, by
+        #### default only on small maps (see heuristics.py)
+        self.heuristics = HeuristicFields(self.rows, self.cols, enabled=heuristic_fields)
+        #### Connected components, a goal in another one fails at once
+        self.components = ComponentIndex(self.walls, self.rows, self.cols)
+        #### Hash of the wall layout, cached routes are kept per version
+        self.map_version = walls_hash(self.walls, self.rows, self.cols)
+        if tables is not None and tables.version != self.map_version:
+            raise ValueError("Distance tables were built for other walls, build them with the same wall_codes")
+        #### Shared next-step fields of common targets, see flowfield.py
+        self.flows = FlowFields(self)
+        #### The other engines search the same walls
+        if self.engine is not None:
+            self.engine.walls = self.walls
+        #### CostMap of the "costmap" engine, None when every step costs 1
+        self.costs = getattr(self.engine, "costs", None)
+        #### Every step is E, W, S or N and costs 1, like in the
+        #### distance tables, unless the engine prices its paths
+        self.unit_steps = not hasattr(self.engine, "path_cost")
+
+    ############################################################
+    #### Manhattan distance
+    ############################################################
+    def heuristic(self, pos, goal):
+        return (abs(pos[0] - goal[0]) + abs(pos[1] - goal[1]))
+
+    ############################################################
+    #### Plan every leg of a delivery round. The robot moves on
+    #### to a goal once it is reached and stays put when a goal
+    #### could not be reached.
+    ############################################################
+    def plan(self, startingPos, destList):
+        began = time.perf_counter()
+        plan = Plan(startingPos)
+        agent_pos = startingPos
+        for goal_pos in destList:
+            path = self.find_path(agent_pos, goal_pos)
+            if path is None:
+                plan.fails.append(goal_pos)
+            else:
+                plan.legs.append(Leg(agent_pos, goal_pos, path, self.path_cost(path)))
+                agent_pos = goal_pos
+        if self.metrics is not None:
+            self.metrics.route_finished(plan, time.perf_counter() - began)
+        return plan
+
+    #### Cost of a path, the number of steps unless the engine prices them
+    def path_cost(self, path):
+        if self.unit_steps:
+            return len(path) - 1
+        return self.engine.path_cost(path)
+
+    ############################################################
+    #### Version cached routes are kept under: the map version,
+    #### plus the version of the costs with a cost map
+    ############################################################
+    def route_version(self):
+        if self.costs is None:
+            return self.map_version
+        return self.map_version + "-" + self.costs.version
+
+    ############################################################
+    #### Open or close a cell, e.g. a room that was sealed. The
+    #### component labels are updated incrementally. Saved
+    #### distance tables no longer match the map and are dropped.
+    ############################################################
+    def set_blocked(self, pos, blocked):
+        i = pos[0] * self.cols + pos[1]
+        if self.walls[i] == (1 if blocked else 0):
+            return
+        self.walls[i] = 1 if blocked else 0
+        self.components.update(pos)
+        self.map_version = walls_hash(self.walls, self.rows, self.cols)
+        self.tables = None
+        if self.engine is not None and hasattr(self.engine, "rebuild"):
+            self.engine.rebuild()
+
+    ############################################################
+    #### Incremental planner for one leg. Blocked or costlier
+    #### cells can be passed to its update_cells() while the
+    #### robot is on the way, see dstarlite.py. It starts from
+    #### the planner's walls, with the cells set_blocked changed,
+    #### and keeps its own copy for the cells it is told about.
+    ############################################################
+    def replanner(self, agent_pos, goal_pos):
+        replanner = DStarLite(self.maze, agent_pos, goal_pos, self.wall_codes)
+        replanner.blocked = bytearray(self.walls)
+        return replanner
+
+    ############################################################
+    #### A* Algorithm. Returns the path from start to goal or
+    #### None when the goal can not be reached. A goal in another
+    #### component fails without a search, cached routes are
+    #### reused and legs covered by the distance tables are
+    #### looked up. The open list can be picked per search by
+    #### name (see openlist.py).
+    #### Expanded cells are closed, so outdated queue entries
+    #### are skipped instead of being expanded again. With
+    #### metrics set every leg is timed and counted.
+    ############################################################
+    def find_path(self, agent_pos, goal_pos, open_list=None):
+        if self.metrics is None:
+            return self.lookup_path(agent_pos, goal_pos, open_list)
+        self.metrics.leg_started(agent_pos, goal_pos)
+        began = time.perf_counter()
+        path = self.lookup_path(agent_pos, goal_pos, open_list)
+        self.metrics.leg_finished(self, agent_pos, goal_pos, path, time.perf_counter() - began)
+        return path
+
+    ############################################################
+    #### Path from the component check, the route cache or a
+    #### search
+    ############################################################
+    def lookup_path(self, agent_pos, goal_pos, open_list=None):
+        #### Start and goal are not connected, there is nothing to search
+        if not self.components.connected(agent_pos, goal_pos):
+            self.last_search = None
+            self.last_source = "components"
+            return None
+
+        #### A cached route skips the search
+        if self.cache is not None:
+            version = self.route_version()
+            path = self.cache.get(agent_pos, goal_pos, version)
+            if path is not None:
+                self.last_search = None
+                self.last_source = "cache"
+                return path
+            path = self.search_path(agent_pos, goal_pos, open_list)
+            if path is not None:
+                self.cache.put(agent_pos, goal_pos, version, path)
+            return path
+        return self.search_path(agent_pos, goal_pos, open_list)
+
+    ############################################################
+    #### Search for a path without the route cache
+    ############################################################
+    def search_path(self, agent_pos, goal_pos, open_list=None):
+
+        #### Precomputed tables need no search at all, they count steps only
+        if self.tables is not None and self.unit_steps and self.tables.covers(agent_pos, goal_pos):
+            self.last_search = None
+            self.last_source = "tables"
+            return self.tables.path(agent_pos, goal_pos)
+
+        if self.engine is not None:
+            self.last_search = None
+            self.last_source = self.search
+            return self.engine.find_path(agent_pos, goal_pos)
+
+        rows, cols, walls = self.rows, self.cols, self.walls
+        state = self.state
+
+        #### A new epoch forgets the previous leg without a reset loop
+        state.new_search()
+        g, stamp, closed, epoch = state.g, state.stamp, state.closed, state.epoch
+
+        start = agent_pos[0] * cols + agent_pos[1]
+        goal = goal_pos[0] * cols + goal_pos[1]
+
+        #### h() of every cell for this goal, read by flat index,
+        #### None when h() is worked out for every cell instead
+        h = self.heuristics.lookup(goal_pos)
+        goal_x, goal_y = goal_pos
+
+        #### Start state's initial values for f(n) = g(n) + h(n)
+        state.set(start, 0, self.heuristic(agent_pos, goal_pos), -1)
+
+        #### Unit moves and Manhattan distance give integer f() values
+        open_set = make_open_list(open_list or self.open_list, integral=True)
+        self.last_search = open_set
+        self.last_source = "astar"
+
+        #### Add the start state to the queue
+        open_set.push(0, start)
+
+        #### Continue exploring until the queue is exhausted
+        while len(open_set):
+            current_cost, current = open_set.pop()
+
+            #### Skip outdated entries of cells that were already expanded
+            if closed[current] == epoch:
+                open_set.stale += 1
+                continue
+            closed[current] = epoch
+
+            #### Stop if goal is reached
+            if current == goal:
+                return self.reconstruct_path(goal)
+
+            x, y = divmod(current, cols)
+
+            #### The cost of moving to a new position is 1 unit
+            new_g = g[current] + 1
+
+            #### Agent goes E, W, N, and S, whenever possible
+            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+                new_x = x + dx
+                new_y = y + dy
+                if 0 <= new_x < rows and 0 <= new_y < cols:
+                    new = new_x * cols + new_y
+                    if walls[new]:
+                        continue
+                    #### Manhattan distance is consistent, a closed cell can not improve
+                    if closed[new] == epoch:
+                        open_set.closed_skips += 1
+                        continue
+                    if stamp[new] != epoch or new_g < g[new]:
+                        ### Update the evaluation function for the cell n: f(n) = g(n) + h(n)
+                        if h is None:
+                            new_f = new_g + abs(new_x - goal_x) + abs(new_y - goal_y)
+                        else:
+                            new_f = new_g + h[new]
+                        state.set(new, new_g, new_f, current)
+
+                        #### Add the new cell to the priority queue
+                        open_set.push(new_f, new)
+        return None
+
+    ############################################################
+    #### Counters of the last leg. A leg that needed no search
+    #### counts 0 for all, an engine that only counts expanded
+    #### cells leaves the others out: they were not measured.
+    ############################################################
+    def search_stats(self):
+        if self.last_source in ("components", "cache", "tables"):
+            return {"expanded": 0, "pushes": 0, "stale": 0, "peak_open": 0}
+        if self.last_search is not None:
+            stats = self.last_search.stats()
+            return {"expanded": stats["expanded"], "pushes": stats["pushes"], "stale": stats["stale"], "peak_open": stats["peak"]}
+        if self.last_source == self.search and self.engine is not None:
+            search = getattr(self.engine, "last_search", None)
+            if search is not None:
+                stats = search.stats()
+                return {"expanded": stats["expanded"], "pushes": stats["pushes"], "stale": stats["stale"], "peak_open": stats["peak"]}
+            return {"expanded": self.engine.expanded}
+        return {}
+
+    ############################################################
+    #### Walk the parents back from the goal and return the
+    #### path from start to goal
+    ############################################################
+    def reconstruct_path(self, goal):
+        cols = self.cols
+        return [divmod(i, cols) for i in self.state.path_to(goal)]
@@ -0,0 +1,105 @@
+########################################################
+#### Fast drawing of the floor and the animated path.
+#### One canvas rectangle per cell and one more per
+#### animation step slows Tk down on big floors and long
+#### routes. Instead:
+####   - the floor is one PhotoImage, one pixel per cell
+####     looked up in WARD_COLORS and zoomed to the cell
+####     size, with the grid drawn as lines on top
+####   - every cell of the path gets one hidden rectangle
+####     up front, a frame only changes its colour
+####   - end nodes are a set, so a step checks them at once
+####   - the frame interval and the steps drawn per frame
+####     can be set, long routes finish in a few seconds
+#### AI, Spring 2024
+########################################################
+import tkinter as tk
+
+#### Colour of every hospital code, see the legend in destinations.py
+WARD_COLORS = {
+    -1: 'gray',
+    0: 'white',
+    1: 'blue',
+    2: 'red4',
+    3: 'yellow',
+    4: 'dark slate gray',
+    5: 'teal',
+    6: 'green',
+    7: 'purple',
+    8: 'orange',
+    9: 'tomato2',
+    10: 'sienna3',
+    11: 'OliveDrab3',
+    12: 'aquamarine',
+    13: 'black',
+}
+
+#### Path colours, the next one is used after every end node
+PATH_COLORS = ['gold3', 'midnight blue', 'orchid1']
+
+
+#### Colour names as #rrggbb, the form PhotoImage.put takes
+def hex_colors(widget, colors):
+    return {code: "#%02x%02x%02x" % tuple(c >> 8 for c in widget.winfo_rgb(name)) for code, name in colors.items()}
+
+
+############################################################
+#### The floor as a single image on the canvas
+############################################################
+class FloorImage:
+    def __init__(self, canvas, maze, cell_size, colors=WARD_COLORS, grid=True):
+        rows = len(maze)
+        cols = len(maze[0])
+        table = hex_colors(canvas, colors)
+        white = table.get(0, "#ffffff")
+        #### NumPy floors are turned into lists once, indexing them per cell is slow
+        if hasattr(maze, "tolist"):
+            maze = maze.tolist()
+        data = " ".join("{" + " ".join(table.get(code, white) for code in row) + "}" for row in maze)
+        image = tk.PhotoImage(master=canvas, width=cols, height=rows)
+        image.put(data)
+        #### Keep a reference, Tk drops images Python no longer holds
+        self.image = image.zoom(cell_size) if cell_size > 1 else image
+        self.item = canvas.create_image(0, 0, anchor="nw", image=self.image)
+        if grid and cell_size > 2:
+            for x in range(rows + 1):
+                canvas.create_line(0, x * cell_size, cols * cell_size, x * cell_size)
+            for y in range(cols + 1):
+                canvas.create_line(y * cell_size, 0, y * cell_size, rows * cell_size)
+
+
+############################################################
+#### Animation of the path, steps_per_frame steps every
+#### interval milliseconds. Stepping onto an end node draws
+#### nothing and switches to the next path colour.
+############################################################
+class PathAnimation:
+    def __init__(self, canvas, cell_size, steps, end_nodes, interval=100, steps_per_frame=1, colors=PATH_COLORS):
+        self.canvas = canvas
+        self.steps = steps
+        self.end_nodes = set(end_nodes)
+        self.interval = interval
+        self.steps_per_frame = max(1, steps_per_frame)
+        self.colors = colors
+        self.color = 0
+        #### One hidden rectangle per path cell, however often it is visited
+        self.items = {}
+        for pos in steps:
+            if pos not in self.end_nodes and pos not in self.items:
+                x, y = pos
+                self.items[pos] = canvas.create_rectangle(y * cell_size, x * cell_size, (y + 1) * cell_size, (x + 1) * cell_size, state="hidden")
+
+    def start(self):
+        if self.steps:
+            self.frame(0)
+
+    def frame(self, index):
+        stop = min(index + self.steps_per_frame, len(self.steps))
+        for pos in self.steps[index:stop]:
+            if pos in self.end_nodes:
+                self.color = (self.color + 1) % len(self.colors)
+            else:
+                self.canvas.itemconfig(self.items[pos], fill=self.colors[self.color], state="normal")
+        # if tiles remain move on to the next frame after a short pause
+        if stop < len(self.steps):
+            self.canvas.after(self.interval, self.frame, stop)
@@ -0,0 +1,243 @@
+########################################################
+#### Route ordering for a delivery round.
+#### findPriority in destinations.py puts the destinations in
+#### priority tiers and groups each tier by ward. This
+#### keeps the tier order but visits the stops of every
+#### tier in a short order, using the path distances
+#### between stops:
+####   - Held-Karp (exact) for small tiers
+####   - nearest neighbour, then 2-opt and Or-opt moves
+####     for large tiers until the time budget runs out
+#### The robot does not return, so every tour is an open
+#### path from the robot's position through the tier.
+#### AI, Spring 2024
+########################################################
+import time
+
+INF = float("inf")
+
+#### Largest tier solved exactly, Held-Karp is O(2^n * n^2)
+EXACT_LIMIT = 10
+
+
+######################################################
+#### Path distances between stops found by a Planner,
+#### in the planner's costs (see Planner.path_cost).
+#### Each pair is only planned once: the way back is the
+#### same path reversed, but with a cost map it costs the
+#### first stop's cell instead of the last one, so both
+#### directions keep their own cost. None means the stop
+#### can not be reached.
+######################################################
+class PathDistances:
+    def __init__(self, planner):
+        self.planner = planner
+        self.known = {}
+
+    def __call__(self, a, b):
+        if a == b:
+            return 0
+        key = (a, b) if a < b else (b, a)
+        if key not in self.known:
+            path = self.planner.find_path(key[0], key[1])
+            if path is None:
+                self.known[key] = None
+            else:
+                self.known[key] = (self.planner.path_cost(path), self.planner.path_cost(path[::-1]))
+        costs = self.known[key]
+        if costs is None:
+            return None
+        return costs[0] if key[0] == a else costs[1]
+
+
+######################################################
+#### Route lengths before and after the optimizer ran
+######################################################
+class RouteReport:
+    def __init__(self, before, after, elapsed):
+        self.before = before
+        self.after = after
+        self.elapsed = elapsed
+
+    def __str__(self):
+        return "Route length before: %d, after: %d (%.1f ms)" % (self.before, self.after, self.elapsed * 1000)
+
+
+############################################################
+#### Length of a round the way the planner drives it: the
+#### robot moves on to every reached stop and stays put
+#### when a stop can not be reached
+############################################################
+def route_length(start, order, distance):
+    total = 0
+    pos = start
+    for stop in order:
+        d = distance(pos, stop)
+        if d is not None:
+            total += d
+            pos = stop
+    return total
+
+
+############################################################
+#### Reorder the stops within every tier. The tiers stay in
+#### their order and each tier starts where the last one
+#### ended. Returns the new flat order and a RouteReport.
+############################################################
+def optimize_route(start, tiers, distance, time_budget=0.5):
+    began = time.perf_counter()
+    deadline = began + time_budget
+    before = route_length(start, [stop for tier in tiers for stop in tier], distance)
+
+    order = []
+    pos = start
+    for tier in tiers:
+        #### Stops that can not be reached keep their place at the end
+        reachable = [stop for stop in tier if distance(pos, stop) is not None]
+        unreachable = [stop for stop in tier if distance(pos, stop) is None]
+        if len(reachable) <= EXACT_LIMIT:
+            tour = held_karp(pos, reachable, distance)
+        else:
+            tour = improve(pos, nearest_neighbour(pos, reachable, distance), distance, deadline)
+        order.extend(tour)
+        order.extend(unreachable)
+        if tour:
+            pos = tour[-1]
+
+    after = route_length(start, order, distance)
+    #### Never hand back a longer route than the one we were given
+    if after > before:
+        order = [stop for tier in tiers for stop in tier]
+        after = before
+    return order, RouteReport(before, after, time.perf_counter() - began)
+
+
+############################################################
+#### Held-Karp dynamic program over subsets of the stops.
+#### best[mask][j] is the shortest path from start that
+#### visits the stops in mask and ends at stop j.
+############################################################
+def held_karp(start, stops, distance):
+    n = len(stops)
+    if n <= 1:
+        return list(stops)
+    d = [[INF if distance(a, b) is None else distance(a, b) for b in stops] for a in stops]
+    full = (1 << n) - 1
+    best = [[INF] * n for _ in range(1 << n)]
+    came_from = [[-1] * n for _ in range(1 << n)]
+    for j in range(n):
+        best[1 << j][j] = distance(start, stops[j])
+
+    for mask in range(1, full + 1):
+        for j in range(n):
+            cost = best[mask][j]
+            if cost == INF or not mask & (1 << j):
+                continue
+            for k in range(n):
+                if mask & (1 << k):
+                    continue
+                new_mask = mask | (1 << k)
+                new_cost = cost + d[j][k]
+                if new_cost < best[new_mask][k]:
+                    best[new_mask][k] = new_cost
+                    came_from[new_mask][k] = j
+
+    #### Walk back from the cheapest end stop
+    j = min(range(n), key=lambda k: best[full][k])
+    mask = full
+    tour = []
+    while j != -1:
+        tour.append(stops[j])
+        j, mask = came_from[mask][j], mask & ~(1 << j)
+    tour.reverse()
+    return tour
+
+
+############################################################
+#### Always go to the closest stop that is left
+############################################################
+def nearest_neighbour(start, stops, distance):
+    left = list(stops)
+    tour = []
+    pos = start
+    while left:
+        stop = min(left, key=lambda s: distance(pos, s))
+        left.remove(stop)
+        tour.append(stop)
+        pos = stop
+    return tour
+
+
+############################################################
+#### Apply improving 2-opt and Or-opt moves to the open
+#### tour until none is left or the deadline has passed
+############################################################
+def improve(start, tour, distance, deadline):
+    path = [start] + tour
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = two_opt(path, distance, deadline) or or_opt(path, distance, deadline)
+    return path[1:]
+
+
+#### Edge cost of the open path, the end of the path costs nothing
+def edge(path, i, distance):
+    if i + 1 >= len(path):
+        return 0
+    return distance(path[i], path[i + 1])
+
+
+############################################################
+#### Reverse path[i..j] when that makes the path shorter.
+#### path[0] is the robot's position and never moves.
+#### The way back may cost something else than the way
+#### there, so path[i..j] is costed in both directions.
+############################################################
+def two_opt(path, distance, deadline):
+    n = len(path)
+    for i in range(1, n - 1):
+        if time.perf_counter() >= deadline:
+            return False
+        forward = 0
+        backward = 0
+        for j in range(i + 1, n):
+            forward += distance(path[j - 1], path[j])
+            backward += distance(path[j], path[j - 1])
+            old = distance(path[i - 1], path[i]) + forward + edge(path, j, distance)
+            new = distance(path[i - 1], path[j]) + backward
+            if j + 1 < n:
+                new += distance(path[i], path[j + 1])
+            if new < old:
+                path[i:j + 1] = reversed(path[i:j + 1])
+                return True
+    return False
+
+
+############################################################
+#### Move a run of 1 to 3 stops to another place in the
+#### path when that makes the path shorter
+############################################################
+def or_opt(path, distance, deadline):
+    n = len(path)
+    for length in (1, 2, 3):
+        for i in range(1, n - length + 1):
+            if time.perf_counter() >= deadline:
+                return False
+            j = i + length - 1
+            #### Cost saved by taking path[i..j] out
+            removed = distance(path[i - 1], path[i]) + edge(path, j, distance)
+            if j + 1 < n:
+                removed -= distance(path[i - 1], path[j + 1])
+            segment = path[i:j + 1]
+            rest = path[:i] + path[j + 1:]
+            for k in range(len(rest)):
+                if k == i - 1:
+                    continue
+                #### Cost added by putting the run after rest[k]
+                added = distance(rest[k], segment[0])
+                if k + 1 < len(rest):
+                    added += distance(segment[-1], rest[k + 1]) - distance(rest[k], rest[k + 1])
+                if added < removed:
+                    path[:] = rest[:k + 1] + segment + rest[k + 1:]
+                    return True
+    return False
@@ -0,0 +1,95 @@
+########################################################
+#### LRU cache of finished routes.
+#### The same supply rooms send to the same ward rooms
+#### all day, so most legs were already planned before.
+#### A route is stored under (start, goal, map version);
+#### the version is the hash of the wall layout, so a
+#### route never outlives the map it was planned on.
+#### Moves are symmetric, so a cached route is also used
+#### backwards for the swapped query.
+#### The least recently used route is dropped once the
+#### cache is full. The cache can be saved to a JSON file
+#### and loaded again after a restart.
+#### AI, Spring 2024
+########################################################
+import json
+import os
+from collections import OrderedDict
+
+
+class RouteCache:
+    def __init__(self, capacity=10000, path=None):
+        self.capacity = capacity
+        #### File the cache is loaded from and saved to, if any
+        self.path = path
+        self.routes = OrderedDict()
+        self.hits = 0
+        self.reverse_hits = 0
+        self.misses = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self.routes)
+
+    ############################################################
+    #### Cached path from start to goal (a new list) or None
+    ############################################################
+    def get(self, start, goal, version):
+        key = (start, goal, version)
+        if key in self.routes:
+            self.routes.move_to_end(key)
+            self.hits += 1
+            return list(self.routes[key])
+        key = (goal, start, version)
+        if key in self.routes:
+            self.routes.move_to_end(key)
+            self.reverse_hits += 1
+            return list(reversed(self.routes[key]))
+        self.misses += 1
+        return None
+
+    ############################################################
+    #### Store a finished path, dropping the oldest route when
+    #### the cache is full
+    ############################################################
+    def put(self, start, goal, version, path):
+        key = (start, goal, version)
+        self.routes[key] = tuple(path)
+        self.routes.move_to_end(key)
+        while len(self.routes) > self.capacity:
+            self.routes.popitem(last=False)
+
+    #### Share of lookups that skipped the search
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.reverse_hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return (self.hits + self.reverse_hits) / lookups
+
+    def stats(self):
+        return {
+            "size": len(self.routes),
+            "hits": self.hits,
+            "reverse_hits": self.reverse_hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+    ############################################################
+    #### Save the routes, oldest first, so loading them keeps
+    #### the LRU order
+    ############################################################
+    def save(self, path=None):
+        path = path or self.path
+        routes = [[list(start), list(goal), version, [list(pos) for pos in route]] for (start, goal, version), route in self.routes.items()]
+        with open(path + ".tmp", "w") as f:
+            json.dump(routes, f)
+        os.replace(path + ".tmp", path)
+
+    def load(self, path):
+        with open(path) as f:
+            routes = json.load(f)
+        for start, goal, version, route in routes:
+            self.put(tuple(start), tuple(goal), version, [tuple(pos) for pos in route])
@@ -0,0 +1,89 @@
+########################################################
+#### Compact search state for grid searches.
+#### Instead of one Cell object per grid square the
+#### g(), f() and parent values live in flat typed arrays
+#### indexed by x * cols + y. Every search gets a new
+#### epoch; a cell whose stamp is not the current epoch
+#### still has its initial values (g = inf, no parent),
+#### so starting a new leg does not touch every cell.
+#### AI, Spring 2024
+########################################################
+from array import array
+
+INF = float("inf")
+
+#### Largest value an unsigned 32 bit stamp can hold
+MAX_EPOCH = 0xFFFFFFFF
+
+
+class SearchState:
+    def __init__(self, size):
+        self.size = size
+        self.g = array('d', [INF]) * size
+        self.f = array('d', [INF]) * size
+        self.parent = array('l', [-1]) * size
+        self.stamp = array('L', [0]) * size
+        #### A cell is closed when closed[i] is the current epoch
+        self.closed = array('L', [0]) * size
+        self.epoch = 0
+
+    ############################################################
+    #### Start a new search. Bumping the epoch invalidates every
+    #### value of the previous search in O(1). The stamps are
+    #### only cleared when the epoch counter wraps around.
+    ############################################################
+    def new_search(self):
+        if self.epoch == MAX_EPOCH:
+            self.stamp = array('L', [0]) * self.size
+            self.closed = array('L', [0]) * self.size
+            self.epoch = 0
+        self.epoch += 1
+
+    #### Cell i was reached during the current search
+    def seen(self, i):
+        return self.stamp[i] == self.epoch
+
+    #### Cell i was already expanded during the current search
+    def is_closed(self, i):
+        return self.closed[i] == self.epoch
+
+    #### Mark cell i as expanded
+    def close(self, i):
+        self.closed[i] = self.epoch
+
+    #### Path cost g() of cell i in the current search
+    def get_g(self, i):
+        if self.stamp[i] == self.epoch:
+            return self.g[i]
+        return INF
+
+    #### Evaluation function f() of cell i in the current search
+    def get_f(self, i):
+        if self.stamp[i] == self.epoch:
+            return self.f[i]
+        return INF
+
+    #### Parent index of cell i in the current search, -1 if none
+    def get_parent(self, i):
+        if self.stamp[i] == self.epoch:
+            return self.parent[i]
+        return -1
+
+    #### Record new g(), f() and parent values for cell i
+    def set(self, i, g, f, parent):
+        self.g[i] = g
+        self.f[i] = f
+        self.parent[i] = parent
+        self.stamp[i] = self.epoch
+
+    ############################################################
+    #### Walk the parents back from cell i and return the list
+    #### of indices from the start of the search to i
+    ############################################################
+    def path_to(self, i):
+        path = []
+        while i != -1:
+            path.append(i)
+            i = self.get_parent(i)
+        path.reverse()
+        return path
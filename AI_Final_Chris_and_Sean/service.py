@@ -0,0 +1,187 @@
+########################################################
+#### Delivery planning service.
+#### Ward terminals send delivery requests over a Unix
+#### socket (or TCP) instead of typing into the blocking
+#### input() loop of AI_Final.py. Every connection may
+#### send many requests, one per line, either in the same
+#### format the script asks for:
+####   (1,6),(20,37),(1,10)
+#### or as JSON:
+####   {"id": 7, "destinations": [[1, 6], [20, 37]]}
+####   {"id": 8, "text": "(1,6),(20,37)"}
+#### The first location is the starting position. Input
+#### is checked the same way as the script does it, the
+#### planning runs in a pool of worker processes, and the
+#### result of every request is sent back as one JSON line
+#### as soon as it is ready, so a slow plan does not hold
+#### up the others. Answers may come back in any order:
+#### each carries the id of its request, and a request
+#### with no id (plain text, or JSON without "id") gets
+#### its number on the connection, counting from 1.
+####
+#### Run with:
+####   python service.py --socket /tmp/nurse.sock
+####   python service.py --port 8765
+#### AI, Spring 2024
+########################################################
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from destinations import checkDestinations, findPriorityTiers, hospital, maze, parseDestinations
+from planner import Planner
+from route import PathDistances, optimize_route
+
+#### Planner of this worker process, built once by init_worker
+workerPlanner = None
+
+#### Workers must not be forked from the server, a forked worker keeps
+#### the sockets open that are connected when it starts
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def init_worker():
+    global workerPlanner
+    workerPlanner = Planner(maze, wall_codes=hospital.wall_codes)
+
+
+############################################################
+#### Plan one delivery round in a worker process: order the
+#### stops by priority, shorten each tier and plan the legs
+############################################################
+def plan_delivery(destList):
+    startingPos = destList[0]
+    tiers = findPriorityTiers(destList[1:])
+    order, report = optimize_route(startingPos, tiers, PathDistances(workerPlanner))
+    plan = workerPlanner.plan(startingPos, order)
+    return {
+        "start": startingPos,
+        "order": order,
+        "legs": [{"goal": leg.goal, "cost": leg.cost, "path": leg.path} for leg in plan.legs],
+        "fails": plan.fails,
+        "cost": plan.cost,
+        "route": {"before": report.before, "after": report.after},
+    }
+
+
+############################################################
+#### Check the JSON destinations the way parseDestinations
+#### checks text: whole, positive numbers only
+############################################################
+def parse_json_destinations(destinations):
+    if not isinstance(destinations, list):
+        return [], "Please enter each location as (row,column)"
+    destList = []
+    for dest in destinations:
+        if not isinstance(dest, list) or len(dest) != 2:
+            return [], "Please enter each location as (row,column)"
+        for value in dest:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return [], "Please enter each location as (row,column)"
+            if not isinstance(value, int) or value < 0:
+                return [], "Negative or decimal input found, please enter positive numbers only " + str(value)
+        destList.append((dest[0], dest[1]))
+    return checkDestinations(destList)
+
+
+############################################################
+#### Turn one request line into (id, destList, error).
+#### number is the request's number on its connection, the
+#### id of a request that has none.
+############################################################
+def parse_request(line, number=None):
+    line = line.strip()
+    if not line.startswith("{"):
+        destList, error = parseDestinations(line)
+        return number, destList, error
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return number, [], "Request is not valid JSON"
+    if not isinstance(request, dict):
+        return number, [], "Request is not a JSON object"
+    requestId = request.get("id", number)
+    if "text" in request:
+        destList, error = parseDestinations(str(request["text"]))
+        return requestId, destList, error
+    destList, error = parse_json_destinations(request.get("destinations", []))
+    return requestId, destList, error
+
+
+class PlanningService:
+    def __init__(self, workers=None):
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(START_METHOD), initializer=init_worker)
+
+    ############################################################
+    #### Read request lines from one connection. Every request
+    #### is planned on its own, answers go out as they finish.
+    #### Requests are numbered from 1 so an answer can always
+    #### be matched. The connection is closed however it ends.
+    ############################################################
+    async def handle(self, reader, writer):
+        tasks = set()
+        number = 0
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                number += 1
+                task = asyncio.ensure_future(self.answer(line.decode("utf-8", "replace"), number, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    ############################################################
+    #### Answer one request line. A request that fails still
+    #### gets an error line back.
+    ############################################################
+    async def answer(self, line, number, writer):
+        requestId = number
+        try:
+            requestId, destList, error = parse_request(line, number)
+            if error:
+                result = {"id": requestId, "status": "error", "error": error}
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self.pool, plan_delivery, destList)
+                result["id"] = requestId
+                result["status"] = "ok"
+        except Exception as e:
+            result = {"id": requestId, "status": "error", "error": "Planning failed: " + repr(e)}
+        writer.write((json.dumps(result) + "\n").encode("utf-8"))
+        await writer.drain()
+
+    async def serve(self, socket_path=None, host="127.0.0.1", port=None):
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self.handle, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hospital delivery planning service")
+    parser.add_argument("--socket", help="Unix socket path to listen on")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="Planning processes (default: one per CPU)")
+    args = parser.parse_args()
+    service = PlanningService(args.workers)
+    try:
+        asyncio.run(service.serve(args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.pool.shutdown()
@@ -0,0 +1,10 @@
+########################################################
+#### The modules of the final project import each other
+#### by name, so the tests run with that folder on the
+#### path.
+#### AI, Spring 2024
+########################################################
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
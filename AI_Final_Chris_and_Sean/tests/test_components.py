@@ -0,0 +1,58 @@
+########################################################
+#### Component labels kept up to date as cells toggle.
+#### AI, Spring 2024
+########################################################
+import random
+
+import components
+from components import NO_COMPONENT, ComponentIndex, label_components
+
+
+#### The index splits and joins exactly like labelling from scratch
+def same_components(index, walls, rows, cols):
+    fresh, count = label_components(walls, rows, cols)
+    pairs = set()
+    for i, label in enumerate(fresh.tolist()):
+        component = index.component(divmod(i, cols))
+        if (label == NO_COMPONENT) != (component == NO_COMPONENT):
+            return False
+        pairs.add((label, component))
+    return len(pairs) == len({label for label, component in pairs}) == len({component for label, component in pairs})
+
+
+#### Closing the middle of a hallway splits it in two
+def test_closing_a_cell_splits_its_component():
+    walls = bytearray(5)
+    index = ComponentIndex(walls, 1, 5)
+    assert index.connected((0, 0), (0, 4))
+    walls[2] = 1
+    index.update((0, 2))
+    assert not index.connected((0, 0), (0, 4))
+    assert index.connected((0, 0), (0, 1))
+    assert index.connected((0, 3), (0, 4))
+    walls[2] = 0
+    index.update((0, 2))
+    assert index.connected((0, 0), (0, 4))
+
+
+def check_random_toggles(seed):
+    rng = random.Random(seed)
+    for trial in range(60):
+        rows, cols = rng.randint(1, 20), rng.randint(1, 20)
+        walls = bytearray(1 if rng.random() < 0.3 else 0 for i in range(rows * cols))
+        index = ComponentIndex(walls, rows, cols)
+        for step in range(20):
+            i = rng.randrange(rows * cols)
+            walls[i] ^= 1
+            index.update(divmod(i, cols))
+            assert same_components(index, walls, rows, cols)
+
+
+def test_random_toggles_match_fresh_labels():
+    check_random_toggles(0)
+
+
+#### Same with every split big enough to be labelled in NumPy
+def test_random_toggles_with_numpy_relabel(monkeypatch):
+    monkeypatch.setattr(components, "FILL_LIMIT", 3)
+    check_random_toggles(1)
@@ -0,0 +1,39 @@
+########################################################
+#### Cells changed one at a time against a cost map
+#### built from scratch with the same costs.
+#### AI, Spring 2024
+########################################################
+import random
+
+import numpy as np
+
+from costmap import CostMap
+
+
+def test_set_cell_cost_matches_a_fresh_build():
+    rng = random.Random(0)
+    maze = np.random.default_rng(0).choice([0, 5, 7, 13], size=(12, 15))
+    costs = CostMap(maze)
+    for _ in range(300):
+        pos = (rng.randrange(12), rng.randrange(15))
+        costs.set_cell_cost(pos, rng.choice([None, 0, 1, 2, 5, 9]))
+        fresh = CostMap(maze)
+        fresh.cell_costs = dict(costs.cell_costs)
+        fresh.build()
+        assert costs.costs == fresh.costs
+        assert (costs.min_cost, costs.cheapest, costs.version) == (fresh.min_cost, fresh.cheapest, fresh.version)
+
+
+def test_version_follows_the_costs():
+    maze = [[0, 0, 5], [0, 13, 7]]
+    costs = CostMap(maze)
+    start = costs.version
+    costs.set_cell_cost((0, 1), 4)
+    assert costs.version != start
+    assert costs.min_cost == 1
+    costs.set_cell_cost((0, 1), None)
+    assert costs.version == start
+    #### Every cheap cell made dearer, the cheapest cost goes up
+    for pos in [(0, 0), (0, 1), (1, 0)]:
+        costs.set_cell_cost(pos, 3)
+    assert costs.min_cost == 3
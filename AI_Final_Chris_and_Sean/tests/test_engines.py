@@ -0,0 +1,100 @@
+########################################################
+#### Every search engine of the Planner against plain A*
+#### on random floors. Engines that find shortest paths
+#### must match its length, HPA* may only be longer, the
+#### cost map and the 8-neighbour engine are checked with
+#### a Dijkstra on their own step costs.
+#### AI, Spring 2024
+########################################################
+import heapq
+import math
+
+import numpy as np
+import pytest
+
+from benchmark import octile_cost
+from planner import ENGINES, Planner
+
+#### Engines whose paths are as short as the ones of A*
+SHORTEST = ("jps", "bidirectional", "ara")
+
+WALL = 13
+
+
+def random_floor(seed, rows=14, cols=17):
+    rng = np.random.default_rng(seed)
+    maze = rng.choice([0, 0, 0, 1, 5, 7], size=(rows, cols))
+    maze[rng.random((rows, cols)) < 0.28] = WALL
+    return maze
+
+
+def queries(maze, seed, count=25):
+    rng = np.random.default_rng(seed + 100)
+    cells = np.argwhere(maze != WALL).tolist()
+    for _ in range(count):
+        start, goal = rng.choice(len(cells), size=2)
+        yield tuple(cells[start]), tuple(cells[goal])
+
+
+#### Cheapest cost from start to goal when entering a cell costs cost(pos)
+def dijkstra_cost(maze, start, goal, cost):
+    rows, cols = maze.shape
+    dist = {start: 0}
+    open_set = [(0, start)]
+    while open_set:
+        current_cost, (x, y) = heapq.heappop(open_set)
+        if (x, y) == goal:
+            return current_cost
+        if current_cost > dist[(x, y)]:
+            continue
+        for new in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if 0 <= new[0] < rows and 0 <= new[1] < cols and maze[new] != WALL:
+                new_cost = current_cost + cost(new)
+                if new_cost < dist.get(new, math.inf):
+                    dist[new] = new_cost
+                    heapq.heappush(open_set, (new_cost, new))
+    return None
+
+
+#### A path from start to goal over open cells, diagonals may not cut a wall corner
+def check_walkable(maze, path, start, goal, diagonal=False):
+    assert path[0] == start and path[-1] == goal
+    for (x, y), (new_x, new_y) in zip(path, path[1:]):
+        assert maze[new_x, new_y] != WALL
+        step = (abs(new_x - x), abs(new_y - y))
+        if diagonal and step == (1, 1):
+            assert maze[new_x, y] != WALL and maze[x, new_y] != WALL
+        else:
+            assert step in ((0, 1), (1, 0))
+
+
+def test_every_engine_is_checked():
+    assert set(ENGINES) == set(SHORTEST) | {"hpa", "costmap", "eightway"}
+
+
+@pytest.mark.parametrize("search", sorted(ENGINES))
+def test_engine_against_astar(search):
+    for seed in range(4):
+        maze = random_floor(seed)
+        astar = Planner(maze)
+        planner = Planner(maze, search=search)
+        if search == "ara":
+            #### No deadline, the schedule runs down to weight 1
+            planner.engine.time_budget = None
+        walls = planner.walls
+        rows, cols = maze.shape
+        for start, goal in queries(maze, seed):
+            expected = astar.find_path(start, goal)
+            path = planner.find_path(start, goal)
+            assert (path is None) == (expected is None), (search, start, goal)
+            if path is None:
+                continue
+            check_walkable(maze, path, start, goal, diagonal=search == "eightway")
+            if search in SHORTEST:
+                assert len(path) == len(expected)
+            elif search == "hpa":
+                assert len(path) >= len(expected)
+            elif search == "costmap":
+                assert planner.path_cost(path) == dijkstra_cost(maze, start, goal, planner.costs.cost)
+            else:
+                assert planner.path_cost(path) == pytest.approx(octile_cost(walls, rows, cols, start, goal))
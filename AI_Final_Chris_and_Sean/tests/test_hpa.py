@@ -0,0 +1,59 @@
+########################################################
+#### The regions and abstract graph of hpa.py against a
+#### flood fill and a BFS per portal.
+#### AI, Spring 2024
+########################################################
+import numpy as np
+
+from hpa import HierarchicalPlanner
+
+
+def random_maze(rows, cols, seed):
+    rng = np.random.default_rng(seed)
+    maze = rng.integers(0, 3, size=(rows, cols))
+    maze[rng.random((rows, cols)) < 0.25] = 13
+    return maze
+
+
+def test_regions_keep_one_code_and_one_cluster():
+    maze = random_maze(23, 31, 0)
+    planner = HierarchicalPlanner(maze, cluster_size=5)
+    cols = planner.cols
+    cells = {}
+    for i, label in enumerate(planner.region):
+        x, y = divmod(i, cols)
+        assert (label == -1) == (maze[x, y] == 13)
+        if label != -1:
+            assert planner.region_code[label] == maze[x, y]
+            cells.setdefault(label, []).append(i)
+    for label, members in cells.items():
+        assert len({(i // cols // 5, i % cols // 5) for i in members}) == 1
+        #### One region is one connected block
+        assert len(planner.region_bfs(members[0])[0]) == len(members)
+
+
+def test_portal_edges_are_region_distances():
+    for seed in range(3):
+        planner = HierarchicalPlanner(random_maze(30, 27, seed), cluster_size=6)
+        for portals in planner.portals:
+            for portal in portals:
+                dist = planner.region_bfs(portal)[0]
+                inside = {other: cost for other, cost in planner.graph[portal].items()
+                          if planner.region[other] == planner.region[portal]}
+                assert inside == {other: dist[other] for other in portals if other != portal}
+
+
+def test_paths_are_walkable():
+    maze = random_maze(40, 40, 5)
+    planner = HierarchicalPlanner(maze)
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        start = tuple(rng.integers(0, 40, size=2).tolist())
+        goal = tuple(rng.integers(0, 40, size=2).tolist())
+        path = planner.find_path(start, goal)
+        if path is None:
+            continue
+        assert path[0] == start and path[-1] == goal
+        for (x, y), (new_x, new_y) in zip(path, path[1:]):
+            assert abs(x - new_x) + abs(y - new_y) == 1
+            assert maze[new_x, new_y] != 13
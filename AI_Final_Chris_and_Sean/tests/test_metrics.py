@@ -0,0 +1,34 @@
+########################################################
+#### Counters a search did not keep are not reported as 0.
+#### AI, Spring 2024
+########################################################
+import json
+
+from metrics import PlannerMetrics
+from planner import Planner
+
+MAZE = [
+    [0, 0, 0, 0],
+    [0, 13, 13, 0],
+    [0, 0, 0, 0],
+]
+
+
+def test_unmeasured_counters_are_null():
+    metrics = PlannerMetrics()
+    Planner(MAZE, search="jps", metrics=metrics).find_path((0, 0), (2, 3))
+    record = json.loads(metrics.json_lines())
+    assert record["expanded"] > 0
+    assert record["pushes"] is None and record["stale"] is None and record["peak_open"] is None
+    text = metrics.prometheus()
+    assert 'planner_expanded_total{source="jps"}' in text
+    assert 'planner_pushes_total{source="jps"}' not in text
+    assert 'planner_open_peak{source="jps"}' not in text
+
+
+def test_astar_counters_are_kept():
+    metrics = PlannerMetrics()
+    Planner(MAZE, metrics=metrics).find_path((0, 0), (2, 3))
+    record = json.loads(metrics.json_lines())
+    assert record["pushes"] > 0 and record["stale"] is not None and record["peak_open"] > 0
+    assert 'planner_pushes_total{source="astar"}' in metrics.prometheus()
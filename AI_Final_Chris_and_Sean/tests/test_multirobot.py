@@ -0,0 +1,51 @@
+########################################################
+#### Fleet planning in hallways too narrow to pass.
+#### AI, Spring 2024
+########################################################
+from multirobot import CONSTRAINT, FleetPlanner, Reservations
+from planner import Planner
+
+#### One cell wide hallway with a pocket below (1, 2)
+HALLWAY = [
+    [0, 0, 0, 0, 0, 0],
+    [13, 13, 0, 13, 13, 13],
+]
+
+
+#### A move forbidden past the last reserved cell still holds
+def test_forbid_move_after_last_reservation():
+    planner = Planner([[0, 0, 0, 0, 0]])
+    table = Reservations()
+    table.forbid_move(CONSTRAINT, (0, 0), (0, 1), 0)
+    table.forbid_move(CONSTRAINT, (0, 0), (0, 1), 1)
+    path = FleetPlanner(planner).search(0, (0, 0), [(0, 4)], 0, table)
+    assert path == [(0, 0), (0, 0), (0, 0), (0, 1), (0, 2), (0, 3), (0, 4)]
+
+
+#### Two robots swap ends, one has to wait in the pocket
+def test_cbs_swaps_two_robots():
+    fleet = FleetPlanner(Planner(HALLWAY), mode="cbs")
+    plan = fleet.plan([((0, 0), [(0, 5)]), ((0, 5), [(0, 0)])])
+    assert plan.mode == "cbs"
+    assert plan.conflict is None
+    assert plan.delivered == 2
+    assert (1, 2) in plan.robots[0].path + plan.robots[1].path
+
+
+#### A robot that can not move is held, the others go around it
+def test_cooperative_never_collides_with_stuck_robot():
+    maze = [
+        [0, 0, 0, 0, 0],
+        [13, 13, 0, 0, 13],
+    ]
+    robots = [
+        ((1, 3), [(1, 2), (0, 0)]),
+        ((0, 0), [(1, 2), (0, 1)]),
+        ((0, 3), [(0, 2), (0, 0)]),
+        ((0, 4), [(0, 0), (1, 3)]),
+        ((0, 2), [(0, 4), (1, 3)]),
+    ]
+    fleet = FleetPlanner(Planner(maze), mode="cooperative", cbs_robots=0)
+    plan = fleet.plan(robots)
+    assert fleet.stuck
+    assert plan.conflict is None
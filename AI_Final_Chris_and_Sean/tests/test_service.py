@@ -0,0 +1,80 @@
+########################################################
+#### Requests and answers of the planning service.
+#### AI, Spring 2024
+########################################################
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from service import PlanningService, parse_request
+
+#### Folder of the final project, the service is imported from there
+PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+#### The service and its workers run without a display
+def test_service_does_not_load_tk():
+    check = "import sys, service; print('tkinter' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", check], cwd=PROJECT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_text_request_gets_its_number_as_id():
+    requestId, destList, error = parse_request("(1,6),(20,37)", 3)
+    assert (requestId, destList, error) == (3, [(1, 6), (20, 37)], None)
+
+
+def test_json_request_keeps_its_id():
+    requestId, destList, error = parse_request('{"id": "a", "destinations": [[1, 6], [20, 37]]}', 3)
+    assert (requestId, destList, error) == ("a", [(1, 6), (20, 37)], None)
+    requestId, destList, error = parse_request('{"destinations": [[1, 6], [20, 37]]}', 4)
+    assert requestId == 4
+
+
+#### JSON is checked like text: no decimals, no negative numbers
+def test_json_rejects_what_text_rejects():
+    for text, destinations in (("(1.5,6),(20,37)", "[[1.5, 6], [20, 37]]"), ("(-1,6),(20,37)", "[[-1, 6], [20, 37]]")):
+        assert parse_request(text, 1)[2] is not None
+        assert parse_request('{"destinations": ' + destinations + '}', 1)[2] is not None
+    for destinations in ('[["1", 6], [20, 37]]', "[[true, 6], [20, 37]]", "[[1, 6, 2], [20, 37]]", "[1, 6]"):
+        assert parse_request('{"destinations": ' + destinations + '}', 1)[2] is not None
+
+
+############################################################
+#### Several text requests on one connection: every answer
+#### carries the number of its request, whatever the order
+############################################################
+def test_answers_match_their_requests():
+    requests = ["(1,6),(20,37)", "(31,20),(11,6),(10,10)", "(1.5,6),(20,37)", "(36,7),(1,10)"]
+
+    async def run(path):
+        service = PlanningService(workers=2)
+        server = await asyncio.start_unix_server(service.handle, path=path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(path)
+            for line in requests:
+                writer.write((line + "\n").encode("utf-8"))
+            await writer.drain()
+            writer.write_eof()
+            answers = [json.loads(line) for line in (await reader.read()).decode("utf-8").splitlines()]
+            writer.close()
+            return answers
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.pool.shutdown()
+
+    with tempfile.TemporaryDirectory() as folder:
+        answers = asyncio.run(run(os.path.join(folder, "nurse.sock")))
+    assert sorted(answer["id"] for answer in answers) == [1, 2, 3, 4]
+    for answer in answers:
+        number = answer["id"]
+        if number == 3:
+            assert answer["status"] == "error"
+        else:
+            assert answer["status"] == "ok"
+            start = parse_request(requests[number - 1])[1][0]
+            assert tuple(answer["start"]) == start
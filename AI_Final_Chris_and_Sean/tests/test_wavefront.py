@@ -0,0 +1,54 @@
+########################################################
+#### The NumPy wavefront against a plain Python BFS.
+#### AI, Spring 2024
+########################################################
+from collections import deque
+
+import numpy as np
+
+from wavefront import MOVES, UNREACHABLE, walk, wavefront
+
+
+#### Steps from every cell to the seed, one cell at a time
+def python_bfs(walls, seed, connectivity):
+    rows, cols = walls.shape
+    dist = np.full(walls.shape, UNREACHABLE, dtype=np.int32)
+    dist[seed] = 0
+    queue = deque([seed])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in MOVES[:connectivity]:
+            new_x, new_y = x + dx, y + dy
+            if not (0 <= new_x < rows and 0 <= new_y < cols) or walls[new_x, new_y] or dist[new_x, new_y] != UNREACHABLE:
+                continue
+            if dx and dy and (walls[x + dx, y] or walls[x, y + dy]):
+                continue
+            dist[new_x, new_y] = dist[x, y] + 1
+            queue.append((new_x, new_y))
+    return dist
+
+
+def test_wavefront_matches_python_bfs():
+    rng = np.random.default_rng(0)
+    for trial in range(40):
+        rows, cols = rng.integers(1, 40, size=2)
+        walls = rng.random((rows, cols)) < 0.35
+        seed = (int(rng.integers(rows)), int(rng.integers(cols)))
+        walls[seed] = False
+        for connectivity in (4, 8):
+            dist, hop = wavefront(walls, seed, connectivity)
+            assert (dist == python_bfs(walls, seed, connectivity)).all()
+            #### Following the hops takes exactly dist steps
+            for x, y in zip(*np.nonzero(dist > 0)):
+                assert len(walk(dist, hop, (x, y))) == dist[x, y] + 1
+
+
+#### A one cell wide hallway that winds over the whole grid
+def test_wavefront_winding_hallway():
+    walls = np.zeros((21, 30), dtype=bool)
+    for x in range(1, 21, 2):
+        walls[x, :] = True
+        walls[x, 29 if x % 4 == 1 else 0] = False
+    dist, hop = wavefront(walls, (0, 0))
+    assert (dist == python_bfs(walls, (0, 0), 4)).all()
+    assert dist[20, 29] == dist.max()
@@ -0,0 +1,158 @@
+########################################################
+#### Whole-grid BFS as NumPy array operations.
+#### A distance field (steps from every cell to the
+#### nearest seed) is what reachability checks, distance
+#### tables and flow fields need. A Python BFS touches one
+#### cell at a time. Here the frontier is a NumPy array of
+#### flat indices into the maze padded with a ring of
+#### walls, so a neighbour is the index plus a fixed offset
+#### and needs no bounds check. Each level is a few array
+#### operations on the frontier only, so the whole field
+#### costs about as much as its open cells and a full
+#### hospital field takes a few ms. A frontier of a few
+#### cells, e.g. in a long hallway, is expanded in Python.
+####
+#### Returns two arrays shaped like the maze:
+####   dist - int32 steps to the nearest seed, -1 for walls
+####          and cells no seed can reach
+####   hop  - int8 index into MOVES of the first step from
+####          the cell towards its seed, -1 for seeds, walls
+####          and unreachable cells
+#### With 8-connectivity every step costs 1 and a diagonal
+#### may not cut the corner of a wall.
+#### AI, Spring 2024
+########################################################
+from array import array
+
+import numpy as np
+
+from grid import WALL_CODES
+
+#### E, W, S, N, then SE, NW, SW, NE. Opposite moves are
+#### pairs (0/1, 2/3, ...), so the way back of move k is k ^ 1.
+MOVES = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)]
+
+#### Cell is not open or no seed can reach it
+UNREACHABLE = -1
+
+#### Frontiers up to this many cells are expanded in Python
+SMALL_FRONTIER = 16
+
+
+#### 2D boolean wall array of a maze
+def wall_grid(maze, wall_codes=WALL_CODES):
+    return np.isin(np.asarray(maze), wall_codes)
+
+
+############################################################
+#### Boolean seed array from one (x, y), a list of cells,
+#### or a boolean array shaped like the maze
+############################################################
+def seed_mask(seeds, shape):
+    if isinstance(seeds, np.ndarray) and seeds.dtype == bool:
+        return seeds.copy()
+    if len(seeds) == 2 and np.isscalar(seeds[0]):
+        seeds = [seeds]
+    mask = np.zeros(shape, dtype=bool)
+    for x, y in seeds:
+        mask[x, y] = True
+    return mask
+
+
+############################################################
+#### One level of a frontier of a few cells, one cell at a
+#### time: in a hallway one cell wide the array operations
+#### would cost more than the cells themselves. Same order
+#### of moves as the array level, so the hops are the same.
+#### Works on the bytearray and array views of the fields.
+############################################################
+def small_level(frontier, level, moves, offsets, width, open_cells, unseen, dist, hop):
+    reached = []
+    for k, (dx, dy) in enumerate(moves):
+        offset = offsets[k]
+        for i in frontier:
+            j = i + offset
+            if not unseen[j]:
+                continue
+            if dx and dy and not (open_cells[i + dx * width] and open_cells[i + dy]):
+                continue
+            unseen[j] = 0
+            hop[j] = k ^ 1
+            dist[j] = level
+            reached.append(j)
+    return reached
+
+
+############################################################
+#### Distance and next-hop arrays of the BFS from the seeds
+#### over the open cells of walls (2D boolean array)
+############################################################
+def wavefront(walls, seeds, connectivity=4):
+    if connectivity not in (4, 8):
+        raise ValueError("Connectivity must be 4 or 8, got " + str(connectivity))
+    walls = np.asarray(walls, dtype=bool)
+    rows, cols = walls.shape
+    moves = MOVES[:connectivity]
+
+    #### Open cells inside a ring of walls, flat by x * (cols + 2) + y
+    width = cols + 2
+    padded = np.zeros((rows + 2, width), dtype=bool)
+    padded[1:-1, 1:-1] = ~walls
+    size = padded.size
+    offsets = [dx * width + dy for dx, dy in moves]
+
+    #### Every field lives in a bytearray or array so small_level()
+    #### can index it fast in Python, the NumPy arrays are views on it
+    open_bytes = bytearray(padded.tobytes())
+    unseen_bytes = bytearray(open_bytes)
+    dist_ints = array('i', [UNREACHABLE]) * size
+    hop_bytes = bytearray(b"\xff") * size
+    open_cells = np.frombuffer(open_bytes, dtype=bool)
+    unseen = np.frombuffer(unseen_bytes, dtype=bool)
+    dist = np.frombuffer(dist_ints, dtype=np.intc)
+    hop = np.frombuffer(hop_bytes, dtype=np.int8)
+
+    padded[1:-1, 1:-1] = seed_mask(seeds, walls.shape)
+    frontier = np.flatnonzero(padded.ravel() & open_cells)
+    dist[frontier] = 0
+    unseen[frontier] = False
+
+    level = 0
+    while len(frontier):
+        level += 1
+        if len(frontier) <= SMALL_FRONTIER:
+            if isinstance(frontier, np.ndarray):
+                frontier = frontier.tolist()
+            frontier = small_level(frontier, level, moves, offsets, width, open_bytes, unseen_bytes, dist_ints, hop_bytes)
+            continue
+        frontier = np.asarray(frontier, dtype=np.intp)
+        reached_all = []
+        for k, (dx, dy) in enumerate(moves):
+            reached = frontier + offsets[k]
+            keep = unseen[reached]
+            #### A diagonal step needs both cells it passes by to be open
+            if dx and dy:
+                keep &= open_cells[frontier + dx * width] & open_cells[frontier + dy]
+            reached = reached[keep]
+            hop[reached] = k ^ 1
+            unseen[reached] = False
+            reached_all.append(reached)
+        frontier = np.concatenate(reached_all)
+        dist[frontier] = level
+    dist = dist.astype(np.int32).reshape(rows + 2, width)[1:-1, 1:-1].copy()
+    return dist, hop.reshape(rows + 2, width)[1:-1, 1:-1].copy()
+
+
+############################################################
+#### Cells from pos to its seed by following the hops,
+#### None if pos can not reach a seed
+############################################################
+def walk(dist, hop, pos):
+    if dist[pos] == UNREACHABLE:
+        return None
+    path = [pos]
+    while hop[pos] != UNREACHABLE:
+        dx, dy = MOVES[hop[pos]]
+        pos = (pos[0] + dx, pos[1] + dy)
+        path.append(pos)
+    return path
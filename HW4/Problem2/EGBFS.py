@@ -6,10 +6,16 @@
 #######################################################
 import tkinter as tk
 from PIL import ImageTk, Image, ImageOps 
-from queue import PriorityQueue
 import math
+import os
+import sys
 
-import numpy as np
+#### The 8-neighbour search lives with the final project
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "AI_Final_Chris_and_Sean"))
+from eightway import EightWayAStar
+
+#### Seed of the tie order, the same seed explores the same way every run
+SEED = 0
 
 
 
@@ -98,48 +104,29 @@ class MazeGame:
     #### GBFS* Algorithm
     ############################################################
     def find_path(self):
-        open_set = PriorityQueue()
-        
-        #### Add the start state to the queue
-        open_set.put((0, self.agent_pos))
-
-        #### Continue exploring until the queue is exhausted
-        while not open_set.empty():
-            current_cost, current_pos = open_set.get()
-            current_cell = self.cells[current_pos[0]][current_pos[1]]
-
-            #### Stop if goal is reached
-            if current_pos == self.goal_pos:
-                self.reconstruct_path()
-                break
-
-            moves = np.array([(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)])
-            np.random.shuffle(moves)
-            #### Agent goes in every direction (8) whenever possible
-            for dx, dy in moves:
-                new_pos = (current_pos[0] + dx, current_pos[1] + dy)
-
-                if 0 <= new_pos[0] < self.rows and 0 <= new_pos[1] < self.cols and not self.cells[new_pos[0]][new_pos[1]].is_wall:
-                
-                    #### The cost of moving to a new position is 1 unit
-                    new_g = current_cell.g + 1
-                    
-                    
-                    if new_g < self.cells[new_pos[0]][new_pos[1]].g:
-                        ### Update the path cost g()
-                        self.cells[new_pos[0]][new_pos[1]].g = new_g
-                        
-                        ### Update the heurstic h()
-                        self.cells[new_pos[0]][new_pos[1]].h = self.heuristic(new_pos)
-                        
-                        ### Update the evaluation function for the cell n: f(n) = h(n)
-                        self.cells[new_pos[0]][new_pos[1]].f = self.cells[new_pos[0]][new_pos[1]].h
-                        self.cells[new_pos[0]][new_pos[1]].parent = current_cell
-                        
-                        #### Add the new cell to the priority queue
-                        open_set.put((self.cells[new_pos[0]][new_pos[1]].f, new_pos))
-                        
-                        
+        #### Every move costs 1, any diagonal to an open cell is allowed and
+        #### ties are broken in a random order that is the same for every run
+        search = EightWayAStar(self.maze, corner_cutting="always", seed=SEED, wall_codes=(1,), diagonal_cost=1, heuristic="euclidean", g_weight=0)
+        path = search.find_path(self.agent_pos, self.goal_pos)
+
+        #### Open list of the search, it counts the outdated entries it skipped
+        #### and the pushes left out for closed cells (see openlist.py)
+        self.open_set = search.last_search
+        if path is None:
+            return
+
+        #### g(), h() and the parents of the path cells for the drawing
+        parent = None
+        for g, pos in enumerate(path):
+            cell = self.cells[pos[0]][pos[1]]
+            cell.g = g
+            cell.h = self.heuristic(pos)
+            cell.f = cell.h
+            cell.parent = parent
+            parent = cell
+        self.reconstruct_path()
+
+
 
     ############################################################
     #### This is for the GUI part. No need to modify this unless
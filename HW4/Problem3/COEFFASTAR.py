@@ -6,7 +6,12 @@
 #######################################################
 import tkinter as tk
 from PIL import ImageTk, Image, ImageOps 
-from queue import PriorityQueue
+import os
+import sys
+
+#### The open lists live with the final project
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "AI_Final_Chris_and_Sean"))
+from openlist import ClosedHeapOpenList
 
 
 ######################################################
@@ -94,14 +99,21 @@ class MazeGame:
     #### A* Algorithm
     ############################################################
     def find_path(self):
-        open_set = PriorityQueue()
+        #### Heap without a lock that keeps the closed cells, it counts the
+        #### outdated entries it skipped and the pushes left out for closed
+        #### cells (see openlist.py)
+        open_set = ClosedHeapOpenList()
+        self.open_set = open_set
         
         #### Add the start state to the queue
-        open_set.put((0, self.agent_pos))
+        open_set.push(0, self.agent_pos)
 
         #### Continue exploring until the queue is exhausted
-        while not open_set.empty():
-            current_cost, current_pos = open_set.get()
+        while True:
+            entry = open_set.next()
+            if entry is None:
+                break
+            current_cost, current_pos = entry
             current_cell = self.cells[current_pos[0]][current_pos[1]]
 
             #### Stop if goal is reached
@@ -131,8 +143,13 @@ class MazeGame:
                         self.cells[new_pos[0]][new_pos[1]].f = (2*new_g) + (1*self.cells[new_pos[0]][new_pos[1]].h)
                         self.cells[new_pos[0]][new_pos[1]].parent = current_cell
                         
+                        #### A cheaper path reopens a cell that was already expanded
+                        open_set.reopen(new_pos)
+
                         #### Add the new cell to the priority queue
-                        open_set.put((self.cells[new_pos[0]][new_pos[1]].f, new_pos))
+                        open_set.push(self.cells[new_pos[0]][new_pos[1]].f, new_pos)
+                    else:
+                        open_set.skip(new_pos)
                         
                         
 